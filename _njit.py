@@ -0,0 +1,15 @@
+"""
+Optional numba JIT for the indicator kernels.
+Falls back to a no-op decorator so the server still runs (in plain Python) without numba installed.
+"""
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, usable bare (@njit) or with options (@njit(cache=True))"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+__all__ = ['njit']
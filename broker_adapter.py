@@ -5,13 +5,21 @@ This module adapts the broker interface to work with the existing tool infrastru
 
 import sys
 import os
+import json
+import functools
 
 # Add brokers directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'brokers'))
 
-from brokers.factory import BrokerFactory
+from brokers.factory import (
+    create_broker,
+    get_broker_info as _get_broker_info,
+    get_broker_info_json,
+    get_broker_info_etag,
+    get_supported_brokers as _get_supported_brokers,
+)
 from brokers.base import BaseBroker
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 # Global broker instance
 current_broker: Optional[BaseBroker] = None
@@ -31,7 +39,7 @@ def initialize_broker(broker_type: str, api_key: str, api_secret: str, paper_mod
         BaseBroker instance
     """
     global current_broker
-    current_broker = BrokerFactory.create_broker(
+    current_broker = create_broker(
         broker_type=broker_type,
         api_key=api_key,
         api_secret=api_secret,
@@ -45,11 +53,23 @@ def get_current_broker() -> Optional[BaseBroker]:
     return current_broker
 
 
+@functools.cache
 def get_broker_info() -> Dict[str, Any]:
-    """Get information about all supported brokers"""
-    return BrokerFactory.get_broker_info()
+    """Get information about all supported brokers (as plain dicts for jsonify; shared - do not mutate)"""
+    return {name: info.to_dict() for name, info in _get_broker_info().items()}
 
 
-def get_supported_brokers() -> list:
+def get_supported_brokers() -> Tuple[str, ...]:
     """Get list of supported broker types"""
-    return BrokerFactory.get_supported_brokers()
+    return _get_supported_brokers()
+
+
+@functools.cache
+def get_brokers_payload() -> Tuple[bytes, str]:
+    """
+    JSON body and ETag for the brokers listing ({'brokers': ..., 'supported': [...]}).
+    The data is static, so it is encoded once and reused for every request.
+    """
+    supported = json.dumps(list(_get_supported_brokers())).encode('utf-8')
+    body = b'{"brokers": ' + get_broker_info_json() + b', "supported": ' + supported + b'}'
+    return body, get_broker_info_etag()
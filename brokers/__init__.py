@@ -3,9 +3,23 @@ Broker abstraction layer for multi-broker support.
 Supports: Alpaca, Bybit, Binance, Interactive Brokers
 """
 
-from .base import BaseBroker
-from .alpaca_broker import AlpacaBroker
-from .bybit_broker import BybitBroker
-from .binance_broker import BinanceBroker
+import importlib
+from .base import BaseBroker, BrokerInfo, Bar, Position, Order
 
-__all__ = ['BaseBroker', 'AlpacaBroker', 'BybitBroker', 'BinanceBroker']
+__all__ = ['BaseBroker', 'BrokerInfo', 'Bar', 'Position', 'Order', 'AlpacaBroker', 'BybitBroker', 'BinanceBroker']
+
+# Broker classes are imported on first access so importing the package doesn't load every SDK
+_LAZY_BROKERS = {
+    'AlpacaBroker': '.alpaca_broker',
+    'BybitBroker': '.bybit_broker',
+    'BinanceBroker': '.binance_broker',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_BROKERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    broker_class = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = broker_class
+    return broker_class
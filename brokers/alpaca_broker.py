@@ -2,9 +2,13 @@
 Alpaca broker implementation
 """
 
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
-from .base import BaseBroker
+from typing import Dict, List, Any, Optional, Iterator
+from datetime import datetime, timedelta, timezone
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from .base import BaseBroker, BrokerInfo
 
 from alpaca.trading.client import TradingClient
 from alpaca.trading.requests import (
@@ -19,10 +23,125 @@ from alpaca.data.requests import (
 from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
 
 
+# Order side lookup - canonical spellings hit directly, anything else is lowercased once
+_SIDE_MAP = {
+    'buy': OrderSide.BUY,
+    'sell': OrderSide.SELL,
+    'BUY': OrderSide.BUY,
+    'SELL': OrderSide.SELL,
+}
+
+_TIF_MAP = {
+    'day': TimeInForce.DAY,
+    'gtc': TimeInForce.GTC,
+    'ioc': TimeInForce.IOC,
+    'fok': TimeInForce.FOK,
+}
+
+
+# Order request builders - all share one signature and ignore the fields they don't need
+def _build_market(symbol, side, qty, notional, limit_price, stop_price, tif):
+    if notional:
+        return MarketOrderRequest(symbol=symbol, notional=notional, side=side, time_in_force=tif)
+    return MarketOrderRequest(symbol=symbol, qty=qty, side=side, time_in_force=tif)
+
+
+def _build_limit(symbol, side, qty, notional, limit_price, stop_price, tif):
+    return LimitOrderRequest(
+        symbol=symbol, qty=qty, side=side,
+        limit_price=limit_price, time_in_force=tif
+    )
+
+
+def _build_stop(symbol, side, qty, notional, limit_price, stop_price, tif):
+    return StopOrderRequest(
+        symbol=symbol, qty=qty, side=side,
+        stop_price=stop_price, time_in_force=tif
+    )
+
+
+def _build_stop_limit(symbol, side, qty, notional, limit_price, stop_price, tif):
+    return StopLimitOrderRequest(
+        symbol=symbol, qty=qty, side=side,
+        stop_price=stop_price, limit_price=limit_price, time_in_force=tif
+    )
+
+
+_ORDER_STATUS_MAP = {
+    'open': QueryOrderStatus.OPEN,
+    'closed': QueryOrderStatus.CLOSED,
+    'all': QueryOrderStatus.ALL,
+}
+
+_ORDER_BUILDERS = {
+    'market': _build_market,
+    'limit': _build_limit,
+    'stop': _build_stop,
+    'stop_limit': _build_stop_limit,
+}
+
+def _enum_value(member):
+    """Raw value of an SDK enum field ('buy' rather than 'OrderSide.BUY'), None passes through"""
+    return member.value if member is not None else None
+
+
+def _f_or(value, default=0.0):
+    """float(value), or default when the SDK field is unset"""
+    return float(value) if value is not None else default
+
+
+# Upper bound on concurrent REST calls for the bulk order helpers (the rate itself is capped by _TokenBucket)
+_MAX_PARALLEL_REQUESTS = 10
+
+# Alpaca's trading API allows 200 requests per minute per account; bursts of up to 10 go out at once
+_RATE_LIMIT_PER_SEC = 200 / 60
+_RATE_LIMIT_BURST = 10
+
+
+class _TokenBucket:
+    """Thread-safe token bucket - acquire() blocks until the next request may be sent"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until it has accrued if the bucket is empty"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Going negative reserves a future token, so concurrent callers queue up in order
+            self.tokens -= 1.0
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+
+# Max age of a cached market clock before it is refetched, even if no open/close boundary was crossed
+_CLOCK_TTL = 30.0
+
+
 class AlpacaBroker(BaseBroker):
     """Alpaca broker implementation"""
     
-    def __init__(self, api_key: str, api_secret: str, paper_mode: bool = True):
+    INFO = BrokerInfo(
+        name='Alpaca',
+        description='US-based broker supporting stocks, crypto, and options',
+        supports_stocks=True,
+        supports_crypto=True,
+        supports_options=True,
+        supports_leverage=True,
+        max_crypto_leverage=1,
+        max_stock_leverage=2,
+        paper_trading=True,
+        website='https://alpaca.markets',
+    )
+    
+    def __init__(self, api_key: str, api_secret: str, paper_mode: bool = True,
+                 warmup: bool = False):
         super().__init__(api_key, api_secret, paper_mode)
         
         # Initialize Alpaca clients
@@ -41,6 +160,39 @@ class AlpacaBroker(BaseBroker):
             api_key=api_key,
             secret_key=api_secret
         )
+        
+        # (clock, monotonic fetch time) from the last get_market_status call
+        self._clock_cache = None
+        
+        # Paces the bulk order helpers' REST calls
+        self._rate_limiter = _TokenBucket(_RATE_LIMIT_PER_SEC, _RATE_LIMIT_BURST)
+        
+        if warmup:
+            self.warm_up()
+    
+    def warm_up(self, timeout: float = 5.0):
+        """
+        Open a connection to each Alpaca endpoint in parallel so the first real
+        call doesn't pay the TLS handshake. Failures are ignored - this is best effort.
+        Waits at most timeout seconds; calls still running then finish in the background.
+        """
+        def warm_clock():
+            self._clock_cache = (self.trading_client.get_clock(), time.monotonic())
+        
+        calls = (
+            warm_clock,
+            lambda: self.stock_data_client.get_stock_latest_quote(
+                StockLatestQuoteRequest(symbol_or_symbols=['SPY'])),
+            lambda: self.crypto_data_client.get_crypto_latest_bar(
+                CryptoLatestBarRequest(symbol_or_symbols=['BTC/USD'])),
+        )
+        
+        executor = ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix='alpaca-warmup')
+        futures = [executor.submit(call) for call in calls]
+        executor.shutdown(wait=False)
+        done, _ = wait(futures, timeout=timeout)
+        for future in done:
+            future.exception()  # Retrieve and discard any error
     
     def get_broker_name(self) -> str:
         return "Alpaca"
@@ -76,7 +228,7 @@ class AlpacaBroker(BaseBroker):
                 'unrealized_pl': float(p.unrealized_pl),
                 'unrealized_pl_percent': float(p.unrealized_plpc) * 100,
                 'side': 'long' if float(p.qty) > 0 else 'short',
-                'asset_class': str(p.asset_class),
+                'asset_class': _enum_value(p.asset_class),
                 'exchange': p.exchange,
             })
         
@@ -97,9 +249,9 @@ class AlpacaBroker(BaseBroker):
         return {
             'order_id': str(order.id),
             'symbol': order.symbol,
-            'status': str(order.status),
-            'side': str(order.side),
-            'qty': float(order.qty) if order.qty else 0,
+            'status': _enum_value(order.status),
+            'side': _enum_value(order.side),
+            'qty': _f_or(order.qty),
         }
     
     def get_crypto_price(self, symbol: str) -> Dict[str, Any]:
@@ -126,7 +278,7 @@ class AlpacaBroker(BaseBroker):
         """Place crypto order"""
         symbol = self.normalize_symbol(symbol, 'crypto')
         
-        order_side = OrderSide.BUY if side.lower() == 'buy' else OrderSide.SELL
+        order_side = _SIDE_MAP.get(side) or _SIDE_MAP.get(side.lower(), OrderSide.SELL)
         
         if notional:
             request = MarketOrderRequest(
@@ -148,11 +300,11 @@ class AlpacaBroker(BaseBroker):
         return {
             'order_id': str(order.id),
             'symbol': order.symbol,
-            'side': str(order.side),
-            'qty': float(order.qty) if order.qty else 0,
-            'notional': float(order.notional) if order.notional else 0,
-            'status': str(order.status),
-            'filled_avg_price': float(order.filled_avg_price) if order.filled_avg_price else 0,
+            'side': _enum_value(order.side),
+            'qty': _f_or(order.qty),
+            'notional': _f_or(order.notional),
+            'status': _enum_value(order.status),
+            'filled_avg_price': _f_or(order.filled_avg_price),
         }
     
     def place_stock_order(self, symbol: str, side: str, qty: Optional[float] = None,
@@ -160,58 +312,45 @@ class AlpacaBroker(BaseBroker):
                          limit_price: Optional[float] = None, stop_price: Optional[float] = None,
                          time_in_force: str = 'day') -> Dict[str, Any]:
         """Place stock order"""
-        order_side = OrderSide.BUY if side.lower() == 'buy' else OrderSide.SELL
-        
-        # Map time_in_force
-        tif_map = {
-            'day': TimeInForce.DAY,
-            'gtc': TimeInForce.GTC,
-            'ioc': TimeInForce.IOC,
-            'fok': TimeInForce.FOK,
-        }
-        tif = tif_map.get(time_in_force.lower(), TimeInForce.DAY)
-        
-        # Create appropriate order request
-        if order_type == 'market':
-            if notional:
-                request = MarketOrderRequest(
-                    symbol=symbol, notional=notional, side=order_side, time_in_force=tif
-                )
-            else:
-                request = MarketOrderRequest(
-                    symbol=symbol, qty=qty, side=order_side, time_in_force=tif
-                )
-        elif order_type == 'limit':
-            request = LimitOrderRequest(
-                symbol=symbol, qty=qty, side=order_side, 
-                limit_price=limit_price, time_in_force=tif
-            )
-        elif order_type == 'stop':
-            request = StopOrderRequest(
-                symbol=symbol, qty=qty, side=order_side,
-                stop_price=stop_price, time_in_force=tif
-            )
-        elif order_type == 'stop_limit':
-            request = StopLimitOrderRequest(
-                symbol=symbol, qty=qty, side=order_side,
-                stop_price=stop_price, limit_price=limit_price, time_in_force=tif
-            )
-        else:
+        order_side = _SIDE_MAP.get(side) or _SIDE_MAP.get(side.lower(), OrderSide.SELL)
+        
+        tif = _TIF_MAP.get(time_in_force.lower(), TimeInForce.DAY)
+        
+        builder = _ORDER_BUILDERS.get(order_type)
+        if builder is None:
             raise ValueError(f"Unsupported order type: {order_type}")
+        request = builder(symbol, order_side, qty, notional, limit_price, stop_price, tif)
         
         order = self.trading_client.submit_order(request)
         
         return {
             'order_id': str(order.id),
             'symbol': order.symbol,
-            'side': str(order.side),
-            'qty': float(order.qty) if order.qty else 0,
-            'order_type': str(order.order_type),
-            'status': str(order.status),
-            'limit_price': float(order.limit_price) if order.limit_price else None,
-            'stop_price': float(order.stop_price) if order.stop_price else None,
+            'side': _enum_value(order.side),
+            'qty': _f_or(order.qty),
+            'order_type': _enum_value(order.order_type),
+            'status': _enum_value(order.status),
+            'limit_price': _f_or(order.limit_price, None),
+            'stop_price': _f_or(order.stop_price, None),
         }
     
+    def place_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Submit several stock orders concurrently
+        Args:
+            orders: List of place_stock_order keyword dicts
+        Returns list of order details in input order; a failed order yields {'error': str}
+        """
+        def submit(order):
+            self._rate_limiter.acquire()
+            try:
+                return self.place_stock_order(**order)
+            except Exception as e:
+                return {'error': str(e), 'symbol': order.get('symbol')}
+        
+        with ThreadPoolExecutor(max_workers=_MAX_PARALLEL_REQUESTS) as executor:
+            return list(executor.map(submit, orders))
+    
     def get_stock_quote(self, symbol: str) -> Dict[str, Any]:
         """Get stock quote"""
         request = StockLatestQuoteRequest(symbol_or_symbols=[symbol])
@@ -265,55 +404,121 @@ class AlpacaBroker(BaseBroker):
                 'low': float(bar.low),
                 'close': float(bar.close),
                 'volume': int(bar.volume),
-                'vwap': float(bar.vwap) if hasattr(bar, 'vwap') and bar.vwap else None,
+                'vwap': _f_or(getattr(bar, 'vwap', None), None),
             })
         
         return result
     
-    def get_orders(self, status: str = 'all') -> List[Dict[str, Any]]:
-        """Get orders"""
-        status_map = {
-            'open': QueryOrderStatus.OPEN,
-            'closed': QueryOrderStatus.CLOSED,
-            'all': QueryOrderStatus.ALL,
-        }
-        
-        request = GetOrdersRequest(status=status_map.get(status, QueryOrderStatus.ALL))
-        orders = self.trading_client.get_orders(filter=request)
-        
-        result = []
-        for order in orders:
-            result.append({
-                'order_id': str(order.id),
-                'symbol': order.symbol,
-                'side': str(order.side),
-                'qty': float(order.qty) if order.qty else 0,
-                'order_type': str(order.order_type),
-                'status': str(order.status),
-                'filled_qty': float(order.filled_qty) if order.filled_qty else 0,
-                'filled_avg_price': float(order.filled_avg_price) if order.filled_avg_price else 0,
-                'created_at': order.created_at.isoformat() if hasattr(order.created_at, 'isoformat') else str(order.created_at),
-            })
+    def get_orders(self, status: str = 'all', limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        """
+        Get orders (newest first)
+        Args:
+            status: 'open', 'closed', 'all'
+            limit: Most orders to return (Alpaca's own default is 50); None pages through them all
+        """
+        if limit is None:
+            return list(self.iter_orders(status))
+        return list(itertools.islice(self.iter_orders(status, page_size=min(limit, 500)), limit))
+    
+    def iter_orders(self, status: str = 'all', page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Stream orders page by page (newest first)
+        Args:
+            status: 'open', 'closed', 'all'
+            page_size: Orders fetched per request (Alpaca caps this at 500)
+        Yields order dicts, so callers can stop early without fetching every page
+        """
+        query_status = _ORDER_STATUS_MAP.get(status, QueryOrderStatus.ALL)
+        until = None
+        previous_ids = set()
         
-        return result
+        while True:
+            request = GetOrdersRequest(status=query_status, limit=page_size, until=until)
+            batch = self.trading_client.get_orders(filter=request)
+            
+            # `until` is exclusive, so the cursor sits just past the last order's timestamp and the
+            # next page starts with the orders sharing it again - skip the ones already yielded
+            new_orders = [order for order in batch if order.id not in previous_ids]
+            if not new_orders:
+                return
+            
+            for order in new_orders:
+                yield self._order_to_dict(order)
+            
+            if len(batch) < page_size:
+                return
+            previous_ids = {order.id for order in batch}
+            until = batch[-1].created_at + timedelta(microseconds=1)
+    
+    @staticmethod
+    def _order_to_dict(order) -> Dict[str, Any]:
+        """Convert an Alpaca order model to an order dict"""
+        return {
+            'order_id': str(order.id),
+            'symbol': order.symbol,
+            'side': _enum_value(order.side),
+            'qty': _f_or(order.qty),
+            'order_type': _enum_value(order.order_type),
+            'status': _enum_value(order.status),
+            'filled_qty': _f_or(order.filled_qty),
+            'filled_avg_price': _f_or(order.filled_avg_price),
+            'created_at': order.created_at.isoformat() if hasattr(order.created_at, 'isoformat') else str(order.created_at),
+        }
     
     def cancel_order(self, order_id: str) -> Dict[str, Any]:
         """Cancel specific order"""
         self.trading_client.cancel_order_by_id(order_id)
         return {'status': 'cancelled', 'order_id': order_id}
     
-    def cancel_all_orders(self) -> Dict[str, Any]:
-        """Cancel all pending orders"""
+    def cancel_orders_by_ids(self, order_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Cancel several orders concurrently
+        Returns list of cancel results in input order; a failed cancel yields {'error': str}
+        """
+        def cancel(order_id):
+            self._rate_limiter.acquire()
+            try:
+                return self.cancel_order(order_id)
+            except Exception as e:
+                return {'error': str(e), 'order_id': order_id}
+        
+        with ThreadPoolExecutor(max_workers=_MAX_PARALLEL_REQUESTS) as executor:
+            return list(executor.map(cancel, order_ids))
+    
+    def cancel_all_orders(self, return_ids: bool = True) -> Dict[str, Any]:
+        """
+        Cancel all pending orders
+        Args:
+            return_ids: Include the cancelled order IDs (skip formatting them when only the count is needed)
+        """
         cancelled = self.trading_client.cancel_orders()
+        if not return_ids:
+            return {'status': 'success', 'cancelled_count': len(cancelled)}
+        
+        ids = [str(o.id) for o in cancelled]
         return {
             'status': 'success',
-            'cancelled_count': len(cancelled),
-            'cancelled_orders': [str(o.id) for o in cancelled]
+            'cancelled_count': len(ids),
+            'cancelled_orders': ids
         }
     
     def get_market_status(self) -> Dict[str, Any]:
         """Get market status"""
+        if self._clock_cache is not None:
+            clock, fetched_at = self._clock_cache
+            now = datetime.now(timezone.utc)
+            # The clock stays valid until the next open/close boundary it reports
+            boundary = clock.next_close if clock.is_open else clock.next_open
+            if time.monotonic() - fetched_at < _CLOCK_TTL and now < boundary:
+                return {
+                    'is_open': clock.is_open,
+                    'next_open': clock.next_open,
+                    'next_close': clock.next_close,
+                    'timestamp': now,
+                }
+        
         clock = self.trading_client.get_clock()
+        self._clock_cache = (clock, time.monotonic())
         return {
             'is_open': clock.is_open,
             'next_open': clock.next_open,
@@ -3,18 +3,234 @@ Base broker interface - all broker implementations must inherit from this.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from typing import ClassVar, Dict, List, Any, Optional
 from datetime import datetime
+from dataclasses import dataclass
+import threading
+import time
+import logging
+
+import requests
+from urllib3.exceptions import HTTPError as _Urllib3Error
+
+logger = logging.getLogger(__name__)
+
+# Request params that pin a GET to the current time - such responses are never worth replaying
+_TIME_PARAMS = frozenset({'startTime', 'endTime', 'start', 'end', 'from', 'to', 'since'})
+# HTTP statuses that mean "try again later" rather than "this request is wrong"
+_STALE_OK_STATUSES = frozenset({418, 429})
+
+
+def ping_without_retries(session: requests.Session, url: str, timeout: float = 2.0) -> bool:
+    """
+    GET url once through the session's own connection pool (so the connection stays warm
+    for later calls) but bypassing its Retry policy - a warm-up must never back off and retry.
+    Returns True if the server answered with a non-error status.
+    """
+    adapter = session.get_adapter(url)
+    request = requests.Request('GET', url).prepare()
+    settings = session.merge_environment_settings(url, {}, None, None, None)
+    try:
+        if hasattr(adapter, 'get_connection_with_tls_context'):  # requests >= 2.32.2
+            conn = adapter.get_connection_with_tls_context(
+                request, settings['verify'], settings['proxies'], settings['cert'])
+        else:
+            conn = adapter.get_connection(url, settings['proxies'])
+        response = conn.urlopen('GET', request.path_url, headers=session.headers,
+                                retries=False, redirect=False, timeout=timeout)
+        return response.status < 400
+    except (_Urllib3Error, OSError, ValueError):
+        return False
+
+
+class StaleList(list):
+    """A list response replayed from the stale cache (the list counterpart of a dict's '_stale': True)"""
+    _stale = True
+
+
+def is_stale(value: Any) -> bool:
+    """True if value was served from the stale cache"""
+    if isinstance(value, dict):
+        return bool(value.get('_stale'))
+    return getattr(value, '_stale', False)
+
+
+class _Record:
+    """Mixin for the slotted row types below - to_dict() gives the plain dict the broker methods return"""
+    __slots__ = ()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass(slots=True, frozen=True)
+class Bar(_Record):
+    """One OHLCV bar (timestamp is an ISO string, timestamp_ms the raw epoch milliseconds)"""
+    timestamp: str
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+    vwap: Optional[float] = None
+    timestamp_ms: Optional[int] = None
+
+
+@dataclass(slots=True, frozen=True)
+class Position(_Record):
+    """An open position"""
+    symbol: str
+    qty: float
+    avg_entry_price: float
+    current_price: float
+    market_value: float
+    unrealized_pl: float
+    unrealized_pl_percent: float
+    side: str
+    asset_class: str
+    exchange: str
+    leverage: int = 1
+
+
+@dataclass(slots=True, frozen=True)
+class Order(_Record):
+    """An order as listed by get_orders"""
+    order_id: str
+    symbol: str
+    side: str
+    qty: float
+    order_type: str
+    status: str
+    filled_qty: float
+    filled_avg_price: float
+    created_at: str
+
+
+@dataclass(slots=True, frozen=True)
+class BrokerInfo(_Record):
+    """Capability metadata for a supported broker"""
+    name: str
+    description: str
+    supports_stocks: bool
+    supports_crypto: bool
+    supports_options: bool
+    supports_leverage: bool
+    max_crypto_leverage: int
+    max_stock_leverage: int
+    paper_trading: bool
+    website: str
 
 
 class BaseBroker(ABC):
     """Abstract base class for broker implementations"""
     
+    # Capability metadata reported by get_broker_info() - set by each implementation
+    INFO: ClassVar[Optional[BrokerInfo]] = None
+    
+    # Freshness lifetimes (seconds) for cached read-only responses
+    PRICE_CACHE_TTL = 1.0
+    ACCOUNT_CACHE_TTL = 5.0
+    POSITIONS_CACHE_TTL = 2.0
+    MARKET_STATUS_CACHE_TTL = 60.0
+    # How old a cached price may be when converting an order's notional to a quantity
+    NOTIONAL_PRICE_TTL = 10.0
+    # Distinct GET requests whose last good response is kept for outages
+    STALE_CACHE_MAX = 128
+    
     def __init__(self, api_key: str, api_secret: str, paper_mode: bool = True):
         self.api_key = api_key
         self.api_secret = api_secret
         self.paper_mode = paper_mode
         
+        # Response cache: key -> (monotonic timestamp, value)
+        self._cache: Dict[Any, tuple] = {}
+        
+        # Last good response per GET request (LRU), served when the broker API is failing
+        self._stale_cache: OrderedDict = OrderedDict()
+        self._stale_lock = threading.Lock()
+        
+    def _cache_get(self, key: Any, ttl: float) -> Optional[Any]:
+        """Return the cached value for key if it is younger than ttl seconds, else None"""
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        return None
+    
+    def _cache_put(self, key: Any, value: Any, stale: bool = False) -> Any:
+        """Store value under key and return it (a stale value is only marked, never stored)"""
+        if stale:
+            return self._mark_stale(value)
+        self._cache[key] = (time.monotonic(), value)
+        return value
+    
+    def invalidate_cache(self):
+        """
+        Drop cached account state (call after any state-changing request).
+        Prices are market data our own orders don't change, so they are kept.
+        """
+        # Snapshot the keys first: executor threads may be writing to the cache meanwhile
+        for key in list(self._cache):
+            if not (isinstance(key, tuple) and key[0] == 'price'):
+                self._cache.pop(key, None)
+    
+    def _notional_to_qty(self, symbol: str, notional: float) -> float:
+        """
+        Convert a dollar amount to a quantity of an already-normalized crypto symbol.
+        Reuses a recently cached price so the order doesn't wait on an extra round-trip.
+        Raises rather than size an order from a stale (outage fallback) price.
+        """
+        price_data = self._cache_get(('price', symbol), self.NOTIONAL_PRICE_TTL) or self.get_crypto_price(symbol)
+        if is_stale(price_data):
+            raise ValueError(f"Cannot size {symbol} order: only a stale price is available")
+        return notional / price_data['price']
+    
+    @staticmethod
+    def _stale_key(*parts: Any, params: Dict[str, Any]) -> Optional[tuple]:
+        """Stale-cache key for a GET, or None if its params are time-based and it shouldn't be kept"""
+        if _TIME_PARAMS.intersection(params):
+            return None
+        return (*parts, frozenset(params.items()))
+    
+    def _stale_store(self, key: Any, value: Any):
+        """Remember value as the last good response for key, evicting the least recently used"""
+        with self._stale_lock:
+            self._stale_cache[key] = value
+            self._stale_cache.move_to_end(key)
+            while len(self._stale_cache) > self.STALE_CACHE_MAX:
+                self._stale_cache.popitem(last=False)
+    
+    @staticmethod
+    def _mark_stale(value: Any) -> Any:
+        """Copy of value tagged as stale ('_stale': True for dicts, StaleList for lists)"""
+        if isinstance(value, dict):
+            return {**value, '_stale': True}
+        if isinstance(value, list):
+            return StaleList(value)
+        return value
+    
+    def _stale_response(self, key: Any, error: Exception) -> Any:
+        """
+        Return the last good response for key, marked stale (see is_stale).
+        Re-raises error unless it is an outage (connection error, timeout, 418/429/5xx)
+        and a response has been stored.
+        """
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None)
+        if status is not None and status not in _STALE_OK_STATUSES and status < 500:
+            raise error
+        with self._stale_lock:
+            if key not in self._stale_cache:
+                raise error
+            self._stale_cache.move_to_end(key)
+            stale = self._stale_cache[key]
+        logger.warning(f"{self.get_broker_name()} request failed ({error}), serving stale response")
+        return self._mark_stale(stale)
+    
+    def warm_up(self):
+        """Open the broker's API connections ahead of the first real call (best effort, no-op by default)"""
+        pass
+    
     @abstractmethod
     def get_broker_name(self) -> str:
         """Return the broker name"""
@@ -81,6 +297,10 @@ class BaseBroker(ABC):
         """
         pass
     
+    def get_crypto_prices(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """Get latest prices for several symbols (brokers may override to fetch concurrently)"""
+        return [self.get_crypto_price(symbol) for symbol in symbols]
+    
     @abstractmethod
     def place_crypto_order(self, symbol: str, side: str, qty: Optional[float] = None, 
                           notional: Optional[float] = None, leverage: Optional[int] = None) -> Dict[str, Any]:
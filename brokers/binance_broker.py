@@ -4,18 +4,54 @@ Supports: Spot, Futures (with leverage), Paper Trading (Testnet)
 """
 
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import time
+import asyncio
 import hmac
-import hashlib
+import json
+import uuid
+from urllib.parse import urlencode
 import requests
-from .base import BaseBroker
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from .base import BaseBroker, BrokerInfo, Bar, Position, Order, is_stale, ping_without_retries
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional - stdlib json also accepts bytes
+    _json_loads = json.loads
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional - only the *_async methods need it
+    aiohttp = None
 
 
 class BinanceBroker(BaseBroker):
     """Binance broker implementation"""
     
-    def __init__(self, api_key: str, api_secret: str, paper_mode: bool = True):
+    INFO = BrokerInfo(
+        name='Binance',
+        description='Largest crypto exchange with spot and futures trading (up to 125x leverage)',
+        supports_stocks=False,
+        supports_crypto=True,
+        supports_options=False,
+        supports_leverage=True,
+        max_crypto_leverage=125,
+        max_stock_leverage=0,
+        paper_trading=True,
+        website='https://www.binance.com',
+    )
+    
+    # Exchange limits on orders per batch request
+    MAX_BATCH_ORDERS = 5
+    MAX_BATCH_CANCELS = 10
+    
+    # Characters dropped from crypto symbols ('BTC/USDT', 'BTC-USDT' -> 'BTCUSDT')
+    _SYMBOL_STRIP = str.maketrans('', '', '/-')
+    
+    def __init__(self, api_key: str, api_secret: str, paper_mode: bool = True, warmup: bool = False):
         super().__init__(api_key, api_secret, paper_mode)
         
         # Use testnet for paper trading
@@ -27,14 +63,53 @@ class BinanceBroker(BaseBroker):
             self.spot_url = "https://api.binance.com"
         
         self.recv_window = 5000
+        self._recv_window_enc = f"&recvWindow={self.recv_window}"
+        self._api_secret_bytes = api_secret.encode('utf-8')
+        # normalize_symbol is pure, so memoize it per (symbol, asset_class)
+        self._symbol_cache = {}
+        
+        # Persistent session so the TCP/TLS connection is reused across calls
+        self._session = requests.Session()
+        # Retry rate limits and transient server errors with exponential backoff - reads and cancels
+        # only. An order POST that timed out or got a 5xx may already have filled, so it is never resent.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'DELETE']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        self._session.mount('https://', adapter)
+        self._session.headers.update({'X-MBX-APIKEY': api_key})
+        
+        if warmup:
+            self.warm_up()
+    
+    def ping(self) -> bool:
+        """
+        Hit the futures ping endpoint to open (or keep alive) the pooled TLS connection,
+        so the next order doesn't pay the handshake. Call periodically to keep it warm.
+        Returns True if the exchange answered.
+        """
+        return ping_without_retries(self._session, f"{self.base_url}/fapi/v1/ping")
+    
+    def warm_up(self):
+        """Open the pooled connection ahead of the first real call"""
+        self.ping()
     
     def _generate_signature(self, params: str) -> str:
         """Generate HMAC SHA256 signature for Binance API"""
-        return hmac.new(
-            self.api_secret.encode('utf-8'),
-            params.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+        return hmac.digest(self._api_secret_bytes, params.encode('utf-8'), 'sha256').hex()
+    
+    def _signed_query(self, params: Dict[str, Any]) -> str:
+        """Build the signed query string - sign exactly the string that is sent, since a str query is passed through untouched"""
+        query_string = urlencode(params)
+        if query_string:
+            query_string += '&'
+        query_string += f"timestamp={time.time_ns() // 1_000_000}{self._recv_window_enc}"
+        return f"{query_string}&signature={self._generate_signature(query_string)}"
     
     def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None,
                      signed: bool = False, use_spot: bool = False) -> Any:
@@ -45,33 +120,70 @@ class BinanceBroker(BaseBroker):
         if params is None:
             params = {}
         
-        headers = {
-            'X-MBX-APIKEY': self.api_key,
-        }
+        # Only reads may fall back to a stale response - orders and cancels must never be silently stale
+        stale_key = self._stale_key(endpoint, use_spot, params=params) if method == 'GET' else None
         
         if signed:
-            params['timestamp'] = int(time.time() * 1000)
-            params['recvWindow'] = self.recv_window
-            query_string = '&'.join([f"{k}={v}" for k, v in params.items()])
-            params['signature'] = self._generate_signature(query_string)
-        
-        if method == 'GET':
-            response = requests.get(url, params=params, headers=headers)
-        elif method == 'POST':
-            response = requests.post(url, params=params, headers=headers)
-        elif method == 'DELETE':
-            response = requests.delete(url, params=params, headers=headers)
-        else:
-            raise ValueError(f"Unsupported method: {method}")
+            params = self._signed_query(params)
+        
+        try:
+            if method == 'GET':
+                response = self._session.get(url, params=params)
+            elif method == 'POST':
+                response = self._session.post(url, params=params)
+            elif method == 'DELETE':
+                response = self._session.delete(url, params=params)
+            else:
+                raise ValueError(f"Unsupported method: {method}")
+            
+            response.raise_for_status()
+        except (requests.HTTPError, requests.ConnectionError, requests.Timeout) as e:
+            if stale_key is None:
+                raise
+            return self._stale_response(stale_key, e)
+        
+        data = _json_loads(response.content)
+        if stale_key is not None:
+            self._stale_store(stale_key, data)
+        return data
+    
+    def _async_client(self) -> 'aiohttp.ClientSession':
+        """
+        Create an aiohttp session for the running event loop. aiohttp sessions are bound to
+        the loop they were created in, so callers own it: `async with broker._async_client() as session`.
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for async requests: pip install aiohttp")
+        return aiohttp.ClientSession(
+            headers={'X-MBX-APIKEY': self.api_key},
+            connector=aiohttp.TCPConnector(limit=16),
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+    
+    async def _make_request_async(self, session: 'aiohttp.ClientSession', method: str, endpoint: str,
+                                  params: Optional[Dict] = None, signed: bool = False,
+                                  use_spot: bool = False) -> Any:
+        """Async counterpart of _make_request, sharing one keep-alive pool across concurrent calls"""
+        base = self.spot_url if use_spot else self.base_url
         
-        response.raise_for_status()
-        return response.json()
+        if params is None:
+            params = {}
+        if signed:
+            params = self._signed_query(params)
+        
+        async with session.request(method, f"{base}{endpoint}", params=params) as response:
+            response.raise_for_status()
+            return _json_loads(await response.read())
     
     def get_broker_name(self) -> str:
         return "Binance"
     
     def get_account(self) -> Dict[str, Any]:
         """Get account information"""
+        cached = self._cache_get('account', self.ACCOUNT_CACHE_TTL)
+        if cached is not None:
+            return cached
+        
         # Get futures account
         futures_account = self._make_request('GET', '/fapi/v2/account', signed=True)
         
@@ -84,7 +196,7 @@ class BinanceBroker(BaseBroker):
                 available_balance = float(asset.get('availableBalance', 0))
                 break
         
-        return {
+        return self._cache_put('account', {
             'cash': available_balance,
             'equity': total_balance,
             'buying_power': available_balance,
@@ -95,35 +207,48 @@ class BinanceBroker(BaseBroker):
             'shorting_enabled': True,
             'account_blocked': False,
             'trading_blocked': False,
-        }
+        }, stale=is_stale(futures_account))
+    
+    def get_positions(self, typed: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get all positions
+        Args:
+            typed: Return Position objects instead of dicts
+        """
+        positions = self._cache_get('positions', self.POSITIONS_CACHE_TTL)
+        if positions is None:
+            positions_data = self._make_request('GET', '/fapi/v2/positionRisk', signed=True)
+            positions = self._cache_put('positions', [
+                self._position_from_risk(pos) for pos in positions_data
+                if float(pos.get('positionAmt', 0)) != 0
+            ], stale=is_stale(positions_data))
+        
+        if typed:
+            return positions
+        result = [pos.to_dict() for pos in positions]
+        return self._mark_stale(result) if is_stale(positions) else result
     
-    def get_positions(self) -> List[Dict[str, Any]]:
-        """Get all positions"""
-        positions_data = self._make_request('GET', '/fapi/v2/positionRisk', signed=True)
-        
-        positions = []
-        for pos in positions_data:
-            pos_amt = float(pos.get('positionAmt', 0))
-            if pos_amt != 0:
-                entry_price = float(pos.get('entryPrice', 0))
-                mark_price = float(pos.get('markPrice', 0))
-                unrealized_pnl = float(pos.get('unRealizedProfit', 0))
-                
-                positions.append({
-                    'symbol': pos['symbol'],
-                    'qty': pos_amt,
-                    'avg_entry_price': entry_price,
-                    'current_price': mark_price,
-                    'market_value': abs(pos_amt * mark_price),
-                    'unrealized_pl': unrealized_pnl,
-                    'unrealized_pl_percent': (unrealized_pnl / (abs(pos_amt) * entry_price) * 100) if entry_price else 0,
-                    'side': 'long' if pos_amt > 0 else 'short',
-                    'asset_class': 'crypto_futures',
-                    'exchange': 'binance',
-                    'leverage': int(pos.get('leverage', 1)),
-                })
-        
-        return positions
+    @staticmethod
+    def _position_from_risk(pos: Dict[str, Any]) -> Position:
+        """Convert a positionRisk entry to a Position"""
+        pos_amt = float(pos.get('positionAmt', 0))
+        entry_price = float(pos.get('entryPrice', 0))
+        mark_price = float(pos.get('markPrice', 0))
+        unrealized_pnl = float(pos.get('unRealizedProfit', 0))
+        
+        return Position(
+            symbol=pos['symbol'],
+            qty=pos_amt,
+            avg_entry_price=entry_price,
+            current_price=mark_price,
+            market_value=abs(pos_amt * mark_price),
+            unrealized_pl=unrealized_pnl,
+            unrealized_pl_percent=(unrealized_pnl / (abs(pos_amt) * entry_price) * 100) if entry_price else 0,
+            side='long' if pos_amt > 0 else 'short',
+            asset_class='crypto_futures',
+            exchange='binance',
+            leverage=int(pos.get('leverage', 1)),
+        )
     
     def close_position(self, symbol: str, qty: Optional[float] = None,
                        percentage: Optional[float] = None) -> Dict[str, Any]:
@@ -154,11 +279,13 @@ class BinanceBroker(BaseBroker):
             'side': close_side,
             'type': 'MARKET',
             'quantity': close_qty,
-            'reduceOnly': 'true'
+            'reduceOnly': 'true',
+            'newClientOrderId': uuid.uuid4().hex,
         }
         
         result = self._make_request('POST', '/fapi/v1/order', params, signed=True)
         
+        self.invalidate_cache()
         return {
             'order_id': str(result.get('orderId')),
             'symbol': symbol,
@@ -171,12 +298,47 @@ class BinanceBroker(BaseBroker):
         """Get latest crypto price"""
         symbol = self.normalize_symbol(symbol, 'crypto')
         
+        cached = self._cache_get(('price', symbol), self.PRICE_CACHE_TTL)
+        if cached is not None:
+            return cached
+        
         ticker = self._make_request('GET', '/fapi/v1/ticker/24hr', {'symbol': symbol})
         
+        return self._cache_put(('price', symbol), self._ticker_to_price(symbol, ticker), stale=is_stale(ticker))
+    
+    async def get_crypto_price_async(self, symbol: str, session: 'aiohttp.ClientSession') -> Dict[str, Any]:
+        """Get latest crypto price without blocking the event loop"""
+        symbol = self.normalize_symbol(symbol, 'crypto')
+        
+        cached = self._cache_get(('price', symbol), self.PRICE_CACHE_TTL)
+        if cached is not None:
+            return cached
+        
+        ticker = await self._make_request_async(session, 'GET', '/fapi/v1/ticker/24hr', {'symbol': symbol})
+        
+        return self._cache_put(('price', symbol), self._ticker_to_price(symbol, ticker))
+    
+    async def get_crypto_prices_async(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """Fetch prices for several symbols concurrently over one connection pool"""
+        async with self._async_client() as session:
+            return await asyncio.gather(*[self.get_crypto_price_async(s, session) for s in symbols])
+    
+    def get_crypto_prices(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get latest prices for several symbols. Requests are issued in parallel when
+        aiohttp is installed, otherwise one after another.
+        """
+        if aiohttp is None:
+            return [self.get_crypto_price(s) for s in symbols]
+        return asyncio.run(self.get_crypto_prices_async(symbols))
+    
+    @staticmethod
+    def _ticker_to_price(symbol: str, ticker: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a 24hr ticker response to the price dict"""
         return {
             'symbol': symbol,
             'price': float(ticker.get('lastPrice', 0)),
-            'timestamp': datetime.fromtimestamp(int(ticker.get('closeTime', 0)) / 1000).isoformat(),
+            'timestamp': datetime.fromtimestamp(int(ticker.get('closeTime', 0)) / 1000, tz=timezone.utc).isoformat(),
             'open': float(ticker.get('openPrice', 0)),
             'high': float(ticker.get('highPrice', 0)),
             'low': float(ticker.get('lowPrice', 0)),
@@ -195,20 +357,21 @@ class BinanceBroker(BaseBroker):
                 'leverage': leverage
             }, signed=True)
         
-        # If notional is provided, calculate quantity
+        # Futures orders need a base quantity - convert notional using a recent price if we have one
         if notional and not qty:
-            price_data = self.get_crypto_price(symbol)
-            qty = notional / price_data['price']
+            qty = self._notional_to_qty(symbol, notional)
         
         params = {
             'symbol': symbol,
             'side': 'BUY' if side.lower() == 'buy' else 'SELL',
             'type': 'MARKET',
             'quantity': qty,
+            'newClientOrderId': uuid.uuid4().hex,
         }
         
         result = self._make_request('POST', '/fapi/v1/order', params, signed=True)
         
+        self.invalidate_cache()
         return {
             'order_id': str(result.get('orderId')),
             'symbol': symbol,
@@ -220,6 +383,88 @@ class BinanceBroker(BaseBroker):
             'leverage': leverage or 1,
         }
     
+    def place_crypto_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place several market orders with one signed request per batch of MAX_BATCH_ORDERS
+        Args:
+            orders: List of place_crypto_order keyword dicts (symbol, side, qty/notional, leverage)
+        Returns list of order details in input order; a rejected order yields {'error': str}
+        """
+        leverage_set = set()
+        batch = []
+        for order in orders:
+            symbol = self.normalize_symbol(order['symbol'], 'crypto')
+            leverage = order.get('leverage')
+            if leverage and leverage > 1 and (symbol, leverage) not in leverage_set:
+                self._make_request('POST', '/fapi/v1/leverage', {
+                    'symbol': symbol,
+                    'leverage': leverage
+                }, signed=True)
+                leverage_set.add((symbol, leverage))
+            
+            qty = order.get('qty')
+            notional = order.get('notional')
+            if notional and not qty:
+                qty = self._notional_to_qty(symbol, notional)
+            
+            batch.append({
+                'symbol': symbol,
+                'side': 'BUY' if order['side'].lower() == 'buy' else 'SELL',
+                'type': 'MARKET',
+                'quantity': str(qty),
+                'newClientOrderId': uuid.uuid4().hex,
+            })
+        
+        # Each chunk stands alone: a failed request becomes inline error entries for its own
+        # orders (like a batch rejection) and the other chunks' results are still returned
+        responses = []
+        for i in range(0, len(batch), self.MAX_BATCH_ORDERS):
+            chunk = batch[i:i + self.MAX_BATCH_ORDERS]
+            try:
+                if len(chunk) == 1:
+                    responses.append(self._make_request('POST', '/fapi/v1/order', chunk[0], signed=True))
+                else:
+                    responses.extend(self._make_request('POST', '/fapi/v1/batchOrders', {
+                        'batchOrders': json.dumps(chunk)
+                    }, signed=True))
+            except requests.RequestException as e:
+                responses.extend([self._rejection(e)] * len(chunk))
+        
+        self.invalidate_cache()
+        
+        results = []
+        for order, params, result in zip(orders, batch, responses):
+            if 'orderId' not in result:
+                results.append({'error': result.get('msg', 'Order rejected'), 'symbol': params['symbol']})
+                continue
+            results.append({
+                'order_id': str(result.get('orderId')),
+                'symbol': params['symbol'],
+                'side': order['side'],
+                'qty': float(result.get('origQty', 0)),
+                'notional': order.get('notional') or 0,
+                'status': result.get('status'),
+                'filled_avg_price': float(result.get('avgPrice', 0)),
+                'leverage': order.get('leverage') or 1,
+            })
+        return results
+    
+    @staticmethod
+    def _rejection(error: requests.RequestException) -> Dict[str, Any]:
+        """Binance's {'code', 'msg'} error body for a failed request, else {'msg': str(error)}"""
+        response = getattr(error, 'response', None)
+        if response is not None:
+            try:
+                body = _json_loads(response.content)
+            except ValueError:
+                body = None
+            if isinstance(body, dict) and 'msg' in body:
+                return body
+        if isinstance(error, requests.HTTPError):
+            return {'msg': str(error)}
+        # No response: the order may or may not have reached the exchange
+        return {'msg': f"Request failed, order status unknown: {error}"}
+    
     def place_stock_order(self, symbol: str, side: str, qty: Optional[float] = None,
                          notional: Optional[float] = None, order_type: str = 'market',
                          limit_price: Optional[float] = None, stop_price: Optional[float] = None,
@@ -232,8 +477,9 @@ class BinanceBroker(BaseBroker):
         raise NotImplementedError("Binance does not support stock trading")
     
     def get_stock_bars(self, symbol: str, timeframe: str, start: datetime,
-                       end: Optional[datetime] = None, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get historical bars (crypto only for Binance)"""
+                       end: Optional[datetime] = None, limit: int = 100,
+                       typed: bool = False) -> List[Dict[str, Any]]:
+        """Get historical bars (crypto only for Binance); typed=True returns Bar objects"""
         symbol = self.normalize_symbol(symbol, 'crypto')
         
         # Map timeframe
@@ -258,53 +504,103 @@ class BinanceBroker(BaseBroker):
             params['endTime'] = int(end.timestamp() * 1000)
         
         klines = self._make_request('GET', '/fapi/v1/klines', params)
-        
-        bars = []
-        for kline in klines:
-            bars.append({
-                'timestamp': datetime.fromtimestamp(int(kline[0]) / 1000).isoformat(),
-                'open': float(kline[1]),
-                'high': float(kline[2]),
-                'low': float(kline[3]),
-                'close': float(kline[4]),
-                'volume': int(float(kline[5])),
-                'vwap': None,
-            })
-        
-        return bars
+        if not klines:
+            return []
+        
+        # Convert the first open time once and offset the rest from it (datetime.fromtimestamp
+        # per kline dominates the loop for large limits). The offsets are added in UTC: local
+        # wall-clock arithmetic would be an hour off for every bar after a DST change.
+        first_ms = int(klines[0][0])
+        base = datetime.fromtimestamp(first_ms / 1000, tz=timezone.utc)
+        
+        bars = [
+            Bar(
+                timestamp=(base + timedelta(milliseconds=int(kline[0]) - first_ms)).isoformat(),
+                open=float(kline[1]),
+                high=float(kline[2]),
+                low=float(kline[3]),
+                close=float(kline[4]),
+                volume=int(float(kline[5])),
+                timestamp_ms=int(kline[0]),
+            )
+            for kline in klines
+        ]
+        
+        return bars if typed else [bar.to_dict() for bar in bars]
     
-    def get_orders(self, status: str = 'all') -> List[Dict[str, Any]]:
-        """Get orders"""
+    def get_orders(self, status: str = 'all', symbol: Optional[str] = None,
+                   typed: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get orders
+        Args:
+            status: 'open', 'closed', 'all'
+            symbol: Restrict the lookup to one symbol (optional)
+            typed: Return Order objects instead of dicts
+        """
+        params = {}
+        if symbol:
+            params['symbol'] = self.normalize_symbol(symbol, 'crypto')
+        
         if status == 'open':
-            result = self._make_request('GET', '/fapi/v1/openOrders', signed=True)
+            result = self._make_request('GET', '/fapi/v1/openOrders', params, signed=True)
         else:
-            result = self._make_request('GET', '/fapi/v1/allOrders', {'limit': 500}, signed=True)
-        
-        orders = []
-        for order in result:
-            orders.append({
-                'order_id': str(order.get('orderId')),
-                'symbol': order.get('symbol'),
-                'side': order.get('side'),
-                'qty': float(order.get('origQty', 0)),
-                'order_type': order.get('type'),
-                'status': order.get('status'),
-                'filled_qty': float(order.get('executedQty', 0)),
-                'filled_avg_price': float(order.get('avgPrice', 0)),
-                'created_at': datetime.fromtimestamp(int(order.get('time', 0)) / 1000).isoformat(),
-            })
-        
-        return orders
+            params['limit'] = 500
+            result = self._make_request('GET', '/fapi/v1/allOrders', params, signed=True)
+        
+        orders = [
+            Order(
+                order_id=str(order.get('orderId')),
+                symbol=order.get('symbol'),
+                side=order.get('side'),
+                qty=float(order.get('origQty', 0)),
+                order_type=order.get('type'),
+                status=order.get('status'),
+                filled_qty=float(order.get('executedQty', 0)),
+                filled_avg_price=float(order.get('avgPrice', 0)),
+                created_at=datetime.fromtimestamp(int(order.get('time', 0)) / 1000, tz=timezone.utc).isoformat(),
+            )
+            for order in result
+        ]
+        
+        return orders if typed else [order.to_dict() for order in orders]
     
     def cancel_order(self, order_id: str) -> Dict[str, Any]:
         """Cancel specific order"""
         params = {'orderId': order_id}
         self._make_request('DELETE', '/fapi/v1/order', params, signed=True)
+        self.invalidate_cache()
         return {'status': 'cancelled', 'order_id': order_id}
     
+    def cancel_orders(self, symbol: str, order_ids: List[str]) -> Dict[str, Any]:
+        """Cancel several orders on one symbol, MAX_BATCH_CANCELS per signed request"""
+        symbol = self.normalize_symbol(symbol, 'crypto')
+        
+        cancelled = []
+        errors = []
+        for i in range(0, len(order_ids), self.MAX_BATCH_CANCELS):
+            chunk = order_ids[i:i + self.MAX_BATCH_CANCELS]
+            result = self._make_request('DELETE', '/fapi/v1/batchOrders', {
+                'symbol': symbol,
+                'orderIdList': json.dumps([int(order_id) for order_id in chunk]),
+            }, signed=True)
+            for order_id, item in zip(chunk, result):
+                if 'orderId' in item:
+                    cancelled.append(str(item['orderId']))
+                else:
+                    errors.append({'order_id': order_id, 'error': item.get('msg')})
+        
+        self.invalidate_cache()
+        return {
+            'status': 'success' if not errors else 'partial',
+            'cancelled_count': len(cancelled),
+            'cancelled_orders': cancelled,
+            'errors': errors,
+        }
+    
     def cancel_all_orders(self) -> Dict[str, Any]:
         """Cancel all pending orders"""
         result = self._make_request('DELETE', '/fapi/v1/allOpenOrders', signed=True)
+        self.invalidate_cache()
         return {
             'status': 'success',
             'cancelled_count': result.get('code', 0),
@@ -313,13 +609,17 @@ class BinanceBroker(BaseBroker):
     
     def get_market_status(self) -> Dict[str, Any]:
         """Get market status - crypto markets are always open"""
-        now = datetime.now()
-        return {
+        cached = self._cache_get('market_status', self.MARKET_STATUS_CACHE_TTL)
+        if cached is not None:
+            return cached
+        
+        now = datetime.now(timezone.utc)
+        return self._cache_put('market_status', {
             'is_open': True,  # Crypto markets are 24/7
             'next_open': now.isoformat(),
             'next_close': (now + timedelta(days=365)).isoformat(),
             'timestamp': now.isoformat(),
-        }
+        })
     
     # Binance-specific capabilities
     
@@ -339,13 +639,20 @@ class BinanceBroker(BaseBroker):
     
     def normalize_symbol(self, symbol: str, asset_class: str) -> str:
         """Normalize symbol for Binance (BTCUSDT format)"""
-        if asset_class in ['crypto', 'crypto_futures']:
-            # Remove slashes and ensure USDT suffix
-            symbol = symbol.replace('/', '').replace('-', '').upper()
-            if not symbol.endswith('USDT'):
-                if symbol.endswith('USD'):
-                    symbol = symbol[:-3] + 'USDT'
-                else:
-                    symbol = symbol + 'USDT'
+        if asset_class not in ('crypto', 'crypto_futures'):
             return symbol
-        return symbol
+        
+        key = (symbol, asset_class)
+        cached = self._symbol_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Remove slashes/dashes in one pass and ensure USDT suffix
+        normalized = symbol.translate(self._SYMBOL_STRIP).upper()
+        if not normalized.endswith('USDT'):
+            if normalized.endswith('USD'):
+                normalized = normalized[:-3] + 'USDT'
+            else:
+                normalized = normalized + 'USDT'
+        self._symbol_cache[key] = normalized
+        return normalized
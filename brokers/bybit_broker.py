@@ -4,18 +4,52 @@ Supports: Spot, Perpetual Futures (with leverage), Paper Trading (Testnet)
 """
 
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import time
 import hmac
-import hashlib
+import json
+import uuid
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from .base import BaseBroker
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from .base import BaseBroker, BrokerInfo, Bar, Position, Order, is_stale, ping_without_retries
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional - stdlib json also accepts bytes
+    _json_loads = json.loads
+
+# (status code key, message key) in Bybit response envelopes
+_V5_STATUS_KEYS = ('retCode', 'retMsg')
+_V2_STATUS_KEYS = ('ret_code', 'ret_msg')
 
 
 class BybitBroker(BaseBroker):
     """Bybit broker implementation"""
     
-    def __init__(self, api_key: str, api_secret: str, paper_mode: bool = True):
+    INFO = BrokerInfo(
+        name='Bybit',
+        description='Crypto exchange with perpetual futures and up to 100x leverage',
+        supports_stocks=False,
+        supports_crypto=True,
+        supports_options=False,
+        supports_leverage=True,
+        max_crypto_leverage=100,
+        max_stock_leverage=0,
+        paper_trading=True,
+        website='https://www.bybit.com',
+    )
+    
+    # Characters dropped from crypto symbols ('BTC/USDT', 'BTC-USDT' -> 'BTCUSDT')
+    _SYMBOL_STRIP = str.maketrans('', '', '/-')
+    
+    # Exchange limit on orders per v5 batch request (linear contracts)
+    MAX_BATCH_ORDERS = 10
+    
+    def __init__(self, api_key: str, api_secret: str, paper_mode: bool = True, warmup: bool = False):
         super().__init__(api_key, api_secret, paper_mode)
         
         # Use testnet for paper trading
@@ -25,58 +59,141 @@ class BybitBroker(BaseBroker):
             self.base_url = "https://api.bybit.com"
         
         self.recv_window = 5000
+        self._api_secret_bytes = api_secret.encode('utf-8')
+        # normalize_symbol is pure, so memoize it per (symbol, asset_class)
+        self._symbol_cache = {}
+        
+        # Persistent session so the TCP/TLS connection is reused across calls
+        self._session = requests.Session()
+        # Retry rate limits and transient server errors with exponential backoff - reads and cancels
+        # only. An order POST that timed out or got a 5xx may already have filled, so it is never resent.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'DELETE']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        self._session.mount('https://', adapter)
+        self._session.headers.update({'Content-Type': 'application/json'})
+        
+        # Two pools (together <= the adapter's pool_maxsize): _executor runs whole broker calls and
+        # _request_executor runs single GETs. Tasks on _executor may wait on _request_executor, never
+        # on their own pool, so a burst of snapshots can't fill it with parents blocked on children.
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='bybit-call')
+        self._request_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='bybit-request')
+        
+        if warmup:
+            self.warm_up()
+    
+    def ping(self) -> bool:
+        """
+        Hit the server time endpoint to open (or keep alive) the pooled TLS connection,
+        so the next order doesn't pay the handshake. Call periodically to keep it warm.
+        Returns True if the exchange answered.
+        """
+        return ping_without_retries(self._session, f"{self.base_url}/v5/market/time")
+    
+    def warm_up(self):
+        """Open the pooled connection ahead of the first real call"""
+        self.ping()
     
     def _generate_signature(self, params: Dict[str, Any]) -> str:
         """Generate HMAC SHA256 signature for Bybit API"""
-        param_str = '&'.join([f"{k}={v}" for k, v in sorted(params.items())])
-        return hmac.new(
-            self.api_secret.encode('utf-8'),
-            param_str.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+        param_str = urlencode(sorted(params.items()))
+        return hmac.digest(self._api_secret_bytes, param_str.encode('utf-8'), 'sha256').hex()
+    
+    def _v5_auth_headers(self, payload: str) -> Dict[str, str]:
+        """Build the v5 API authentication headers for a query string or JSON body"""
+        timestamp = str(time.time_ns() // 1_000_000)
+        recv_window = str(self.recv_window)
+        sign_str = timestamp + self.api_key + recv_window + payload
+        return {
+            'X-BAPI-API-KEY': self.api_key,
+            'X-BAPI-TIMESTAMP': timestamp,
+            'X-BAPI-RECV-WINDOW': recv_window,
+            'X-BAPI-SIGN': hmac.digest(self._api_secret_bytes, sign_str.encode('utf-8'), 'sha256').hex(),
+        }
     
     def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, 
-                     signed: bool = False) -> Dict[str, Any]:
-        """Make authenticated request to Bybit API"""
+                     signed: bool = False, ext_info: bool = False) -> Dict[str, Any]:
+        """
+        Make authenticated request to Bybit API
+        Args:
+            ext_info: Return (result, retExtInfo) - v5 batch endpoints report per-item status there
+        """
         url = f"{self.base_url}{endpoint}"
         
         if params is None:
             params = {}
         
-        if signed:
-            timestamp = int(time.time() * 1000)
-            params['api_key'] = self.api_key
-            params['timestamp'] = timestamp
-            params['recv_window'] = self.recv_window
+        # Only reads may fall back to a stale response - orders and cancels must never be silently stale
+        stale_key = self._stale_key(endpoint, params=params) if method == 'GET' else None
+        
+        headers = None
+        body = None
+        if signed and endpoint.startswith('/v5/'):
+            # v5 signs timestamp + key + recv_window + payload and sends the auth in headers
+            body = urlencode(params) if method == 'GET' else json.dumps(params)
+            headers = self._v5_auth_headers(body)
+        elif signed:
+            # Build a fresh dict so the caller's params are never mutated and each call gets a new timestamp
+            params = {
+                **params,
+                'api_key': self.api_key,
+                'timestamp': time.time_ns() // 1_000_000,
+                'recv_window': self.recv_window,
+            }
             params['sign'] = self._generate_signature(params)
         
-        headers = {
-            'Content-Type': 'application/json',
-        }
-        
-        if method == 'GET':
-            response = requests.get(url, params=params, headers=headers)
-        else:
-            response = requests.post(url, json=params, headers=headers)
-        
-        response.raise_for_status()
-        data = response.json()
-        
-        if data.get('ret_code') != 0 and data.get('retCode') != 0:
-            raise Exception(f"Bybit API error: {data.get('ret_msg') or data.get('retMsg')}")
-        
-        return data.get('result', {})
+        try:
+            if method == 'GET':
+                response = self._session.get(url, params=params, headers=headers)
+            elif body is not None:
+                response = self._session.post(url, data=body, headers=headers)
+            else:
+                response = self._session.post(url, json=params)
+            
+            response.raise_for_status()
+        except (requests.HTTPError, requests.ConnectionError, requests.Timeout) as e:
+            if stale_key is None:
+                raise
+            return self._stale_response(stale_key, e)
+        
+        data = _json_loads(response.content)
+        
+        # v5 responses use camelCase keys, v2 snake_case - pick by endpoint, fall back if absent
+        code_key, msg_key = _V5_STATUS_KEYS if endpoint.startswith('/v5/') else _V2_STATUS_KEYS
+        code = data.get(code_key)
+        if code is None:
+            code_key, msg_key = _V2_STATUS_KEYS if code_key == 'retCode' else _V5_STATUS_KEYS
+            code = data.get(code_key)
+        if code != 0:
+            raise Exception(f"Bybit API error: {data.get(msg_key)}")
+        
+        result = data.get('result', {})
+        if stale_key is not None:
+            self._stale_store(stale_key, result)
+        if ext_info:
+            return result, data.get('retExtInfo') or {}
+        return result
     
     def get_broker_name(self) -> str:
         return "Bybit"
     
     def get_account(self) -> Dict[str, Any]:
         """Get account information"""
-        # Get wallet balance (for futures/derivatives)
-        wallet = self._make_request('GET', '/v2/private/wallet/balance', signed=True)
+        cached = self._cache_get('account', self.ACCOUNT_CACHE_TTL)
+        if cached is not None:
+            return cached
         
-        # Get spot balance
-        spot = self._make_request('GET', '/spot/v3/private/account', signed=True)
+        # Wallet balance (futures/derivatives) and spot balance are independent - fetch both at once
+        wallet_future = self._request_executor.submit(self._make_request, 'GET', '/v2/private/wallet/balance', signed=True)
+        spot_future = self._request_executor.submit(self._make_request, 'GET', '/spot/v3/private/account', signed=True)
+        wallet = wallet_future.result()
+        spot = spot_future.result()
         
         # Combine balances
         total_equity = 0
@@ -93,7 +210,7 @@ class BybitBroker(BaseBroker):
                 total_available += float(balance.get('free', 0))
                 total_equity += float(balance.get('free', 0)) + float(balance.get('locked', 0))
         
-        return {
+        return self._cache_put('account', {
             'cash': total_available,
             'equity': total_equity,
             'buying_power': total_available,  # Bybit doesn't have separate buying power concept
@@ -104,36 +221,71 @@ class BybitBroker(BaseBroker):
             'shorting_enabled': True,
             'account_blocked': False,
             'trading_blocked': False,
-        }
+        }, stale=is_stale(wallet) or is_stale(spot))
     
-    def get_positions(self) -> List[Dict[str, Any]]:
-        """Get all positions"""
-        positions = []
-        
-        # Get futures positions
-        futures_pos = self._make_request('GET', '/v2/private/position/list', signed=True)
-        
-        for pos in futures_pos:
-            if float(pos.get('size', 0)) > 0:
-                side = 'long' if pos.get('side') == 'Buy' else 'short'
-                qty = float(pos.get('size', 0))
-                
-                positions.append({
-                    'symbol': pos['symbol'],
-                    'qty': qty if side == 'long' else -qty,
-                    'avg_entry_price': float(pos.get('entry_price', 0)),
-                    'current_price': float(pos.get('liq_price', 0)),
-                    'market_value': float(pos.get('position_value', 0)),
-                    'unrealized_pl': float(pos.get('unrealised_pnl', 0)),
-                    'unrealized_pl_percent': (float(pos.get('unrealised_pnl', 0)) / 
-                                             float(pos.get('position_value', 1))) * 100,
-                    'side': side,
-                    'asset_class': 'crypto_futures',
-                    'exchange': 'bybit',
-                    'leverage': int(pos.get('leverage', 1)),
-                })
-        
-        return positions
+    def get_positions(self, typed: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get all positions
+        Args:
+            typed: Return Position objects instead of dicts
+        """
+        positions = self._cache_get('positions', self.POSITIONS_CACHE_TTL)
+        if positions is None:
+            # USDT perpetual positions - v5 includes the mark price, so no per-symbol price lookups are needed
+            params = {'category': 'linear', 'settleCoin': 'USDT', 'limit': 200}
+            positions = []
+            stale = False
+            while True:
+                result = self._make_request('GET', '/v5/position/list', dict(params), signed=True)
+                stale = stale or is_stale(result)
+                positions.extend(
+                    self._position_from_list(pos) for pos in result.get('list', [])
+                    if float(pos.get('size') or 0) > 0
+                )
+                cursor = result.get('nextPageCursor')
+                if not cursor or not result.get('list'):
+                    break
+                params['cursor'] = cursor
+            positions = self._cache_put('positions', positions, stale=stale)
+        
+        if typed:
+            return positions
+        result = [pos.to_dict() for pos in positions]
+        return self._mark_stale(result) if is_stale(positions) else result
+    
+    @staticmethod
+    def _position_from_list(pos: Dict[str, Any]) -> Position:
+        """Convert a v5 position list entry to a Position"""
+        side = 'long' if pos.get('side') == 'Buy' else 'short'
+        qty = float(pos.get('size') or 0)
+        entry_price = float(pos.get('avgPrice') or 0)
+        mark_price = float(pos.get('markPrice') or 0)
+        unrealized_pnl = float(pos.get('unrealisedPnl') or 0)
+        
+        return Position(
+            symbol=pos['symbol'],
+            qty=qty if side == 'long' else -qty,
+            avg_entry_price=entry_price,
+            current_price=mark_price,
+            market_value=qty * mark_price,
+            unrealized_pl=unrealized_pnl,
+            unrealized_pl_percent=(unrealized_pnl / (qty * entry_price) * 100) if entry_price else 0,
+            side=side,
+            asset_class='crypto_futures',
+            exchange='bybit',
+            leverage=int(float(pos.get('leverage') or 1)),
+        )
+    
+    def get_snapshot(self) -> Dict[str, Any]:
+        """Fetch account, positions and open orders concurrently (e.g. for a dashboard refresh)"""
+        account = self._executor.submit(self.get_account)
+        positions = self._executor.submit(self.get_positions)
+        orders = self._executor.submit(self.get_orders, 'open')
+        return {
+            'account': account.result(),
+            'positions': positions.result(),
+            'open_orders': orders.result(),
+        }
     
     def close_position(self, symbol: str, qty: Optional[float] = None,
                        percentage: Optional[float] = None) -> Dict[str, Any]:
@@ -166,11 +318,13 @@ class BybitBroker(BaseBroker):
             'qty': close_qty,
             'time_in_force': 'GoodTillCancel',
             'reduce_only': True,
-            'close_on_trigger': False
+            'close_on_trigger': False,
+            'order_link_id': uuid.uuid4().hex,
         }
         
         result = self._make_request('POST', '/v2/private/order/create', params, signed=True)
         
+        self.invalidate_cache()
         return {
             'order_id': result.get('order_id'),
             'symbol': symbol,
@@ -183,19 +337,23 @@ class BybitBroker(BaseBroker):
         """Get latest crypto price"""
         symbol = self.normalize_symbol(symbol, 'crypto')
         
+        cached = self._cache_get(('price', symbol), self.PRICE_CACHE_TTL)
+        if cached is not None:
+            return cached
+        
         result = self._make_request('GET', '/v2/public/tickers', {'symbol': symbol})
         
         ticker = result[0] if isinstance(result, list) else result
         
-        return {
+        return self._cache_put(('price', symbol), {
             'symbol': symbol,
             'price': float(ticker.get('last_price', 0)),
-            'timestamp': datetime.fromtimestamp(int(ticker.get('time', 0)) / 1000).isoformat(),
+            'timestamp': datetime.fromtimestamp(int(ticker.get('time', 0)) / 1000, tz=timezone.utc).isoformat(),
             'open': float(ticker.get('open_value', 0)),
             'high': float(ticker.get('high_price_24h', 0)),
             'low': float(ticker.get('low_price_24h', 0)),
             'volume': float(ticker.get('volume_24h', 0)),
-        }
+        }, stale=is_stale(result))
     
     def place_crypto_order(self, symbol: str, side: str, qty: Optional[float] = None,
                           notional: Optional[float] = None, leverage: Optional[int] = None) -> Dict[str, Any]:
@@ -209,10 +367,9 @@ class BybitBroker(BaseBroker):
                 'leverage': leverage
             }, signed=True)
         
-        # If notional is provided, get current price and calculate qty
+        # Futures orders need a base quantity - convert notional using a recent price if we have one
         if notional and not qty:
-            price_data = self.get_crypto_price(symbol)
-            qty = notional / price_data['price']
+            qty = self._notional_to_qty(symbol, notional)
         
         params = {
             'symbol': symbol,
@@ -221,11 +378,13 @@ class BybitBroker(BaseBroker):
             'qty': qty,
             'time_in_force': 'GoodTillCancel',
             'reduce_only': False,
-            'close_on_trigger': False
+            'close_on_trigger': False,
+            'order_link_id': uuid.uuid4().hex,
         }
         
         result = self._make_request('POST', '/v2/private/order/create', params, signed=True)
         
+        self.invalidate_cache()
         return {
             'order_id': result.get('order_id'),
             'symbol': symbol,
@@ -237,6 +396,80 @@ class BybitBroker(BaseBroker):
             'leverage': leverage or 1,
         }
     
+    def place_crypto_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place several market orders with one signed v5 request per batch of MAX_BATCH_ORDERS
+        Args:
+            orders: List of place_crypto_order keyword dicts (symbol, side, qty/notional, leverage)
+        Returns list of order details in input order; a rejected order yields {'error': str}
+        """
+        leverage_set = set()
+        batch = []
+        results = [None] * len(orders)
+        for i, order in enumerate(orders):
+            symbol = self.normalize_symbol(order['symbol'], 'crypto')
+            try:
+                leverage = order.get('leverage')
+                if leverage and leverage > 1 and (symbol, leverage) not in leverage_set:
+                    self._make_request('POST', '/v2/private/position/leverage/save', {
+                        'symbol': symbol,
+                        'leverage': leverage
+                    }, signed=True)
+                    leverage_set.add((symbol, leverage))
+                
+                qty = order.get('qty')
+                notional = order.get('notional')
+                if notional and not qty:
+                    qty = self._notional_to_qty(symbol, notional)
+            except Exception as e:
+                results[i] = {'error': str(e), 'symbol': symbol}
+                continue
+            
+            batch.append((i, {
+                'symbol': symbol,
+                'side': 'Buy' if order['side'].lower() == 'buy' else 'Sell',
+                'orderType': 'Market',
+                'qty': str(qty),
+                'orderLinkId': uuid.uuid4().hex,
+            }))
+        
+        # Each chunk stands alone: a failed request becomes inline error entries for its own
+        # orders and the other chunks' results are still returned
+        for start in range(0, len(batch), self.MAX_BATCH_ORDERS):
+            chunk = batch[start:start + self.MAX_BATCH_ORDERS]
+            try:
+                result, ext = self._make_request('POST', '/v5/order/create-batch', {
+                    'category': 'linear',
+                    'request': [params for _, params in chunk],
+                }, signed=True, ext_info=True)
+                created = result.get('list') or []
+                statuses = ext.get('list') or []
+            except Exception as e:
+                for i, params in chunk:
+                    results[i] = {'error': str(e), 'symbol': params['symbol']}
+                continue
+            
+            for n, (i, params) in enumerate(chunk):
+                item = created[n] if n < len(created) else {}
+                status = statuses[n] if n < len(statuses) else {}
+                if status.get('code', 0) != 0 or not item.get('orderId'):
+                    results[i] = {'error': status.get('msg') or 'Order rejected', 'symbol': params['symbol']}
+                    continue
+                order = orders[i]
+                results[i] = {
+                    'order_id': item['orderId'],
+                    'symbol': params['symbol'],
+                    'side': order['side'],
+                    'qty': float(params['qty']),
+                    'notional': order.get('notional') or 0,
+                    'status': 'submitted',
+                    'filled_avg_price': 0,
+                    'leverage': order.get('leverage') or 1,
+                }
+        
+        self.invalidate_cache()
+        return results
+    
     def place_stock_order(self, symbol: str, side: str, qty: Optional[float] = None,
                          notional: Optional[float] = None, order_type: str = 'market',
                          limit_price: Optional[float] = None, stop_price: Optional[float] = None,
@@ -249,8 +482,9 @@ class BybitBroker(BaseBroker):
         raise NotImplementedError("Bybit does not support stock trading")
     
     def get_stock_bars(self, symbol: str, timeframe: str, start: datetime,
-                       end: Optional[datetime] = None, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get historical bars (crypto only for Bybit)"""
+                       end: Optional[datetime] = None, limit: int = 100,
+                       typed: bool = False) -> List[Dict[str, Any]]:
+        """Get historical bars (crypto only for Bybit); typed=True returns Bar objects"""
         symbol = self.normalize_symbol(symbol, 'crypto')
         
         # Map timeframe
@@ -272,59 +506,109 @@ class BybitBroker(BaseBroker):
         }
         
         result = self._make_request('GET', '/v2/public/kline/list', params)
-        
-        bars = []
-        for bar in result:
-            bars.append({
-                'timestamp': datetime.fromtimestamp(int(bar.get('open_time', 0))).isoformat(),
-                'open': float(bar.get('open', 0)),
-                'high': float(bar.get('high', 0)),
-                'low': float(bar.get('low', 0)),
-                'close': float(bar.get('close', 0)),
-                'volume': int(bar.get('volume', 0)),
-                'vwap': None,
-            })
-        
-        return bars
+        if not result:
+            return []
+        
+        # Convert the first open time once and offset the rest from it (datetime.fromtimestamp
+        # per bar dominates the loop for large limits). The offsets are added in UTC: local
+        # wall-clock arithmetic would be an hour off for every bar after a DST change.
+        first_ts = int(result[0].get('open_time', 0))
+        base = datetime.fromtimestamp(first_ts, tz=timezone.utc)
+        
+        bars = [
+            Bar(
+                timestamp=(base + timedelta(seconds=int(bar.get('open_time', 0)) - first_ts)).isoformat(),
+                open=float(bar.get('open', 0)),
+                high=float(bar.get('high', 0)),
+                low=float(bar.get('low', 0)),
+                close=float(bar.get('close', 0)),
+                volume=int(bar.get('volume', 0)),
+                timestamp_ms=int(bar.get('open_time', 0)) * 1000,
+            )
+            for bar in result
+        ]
+        
+        return bars if typed else [bar.to_dict() for bar in bars]
     
-    def get_orders(self, status: str = 'all') -> List[Dict[str, Any]]:
-        """Get orders"""
-        params = {}
-        
+    def get_orders(self, status: str = 'all', typed: bool = False) -> List[Dict[str, Any]]:
+        """Get orders (USDT linear contracts, all symbols); typed=True returns Order objects"""
         if status == 'open':
-            endpoint = '/v2/private/order'
+            endpoint = '/v5/order/realtime'
         else:
-            endpoint = '/v2/private/order/list'
+            endpoint = '/v5/order/history'
         
-        result = self._make_request('GET', endpoint, params, signed=True)
+        params = {'category': 'linear', 'settleCoin': 'USDT', 'limit': 50}
         
         orders = []
-        data = result.get('data', []) if isinstance(result.get('data'), list) else [result]
-        
-        for order in data:
-            orders.append({
-                'order_id': order.get('order_id'),
-                'symbol': order.get('symbol'),
-                'side': order.get('side'),
-                'qty': float(order.get('qty', 0)),
-                'order_type': order.get('order_type'),
-                'status': order.get('order_status'),
-                'filled_qty': float(order.get('cum_exec_qty', 0)),
-                'filled_avg_price': float(order.get('price', 0)),
-                'created_at': datetime.fromtimestamp(int(order.get('created_time', 0)) / 1000).isoformat(),
-            })
-        
-        return orders
+        while True:
+            result = self._make_request('GET', endpoint, dict(params), signed=True)
+            
+            orders.extend(
+                Order(
+                    order_id=order.get('orderId'),
+                    symbol=order.get('symbol'),
+                    side=order.get('side'),
+                    qty=float(order.get('qty') or 0),
+                    order_type=order.get('orderType'),
+                    status=order.get('orderStatus'),
+                    filled_qty=float(order.get('cumExecQty') or 0),
+                    filled_avg_price=float(order.get('avgPrice') or 0),
+                    created_at=datetime.fromtimestamp(int(order.get('createdTime') or 0) / 1000, tz=timezone.utc).isoformat(),
+                )
+                for order in result.get('list', [])
+            )
+            
+            cursor = result.get('nextPageCursor')
+            if not cursor or not result.get('list'):
+                break
+            params['cursor'] = cursor
+        
+        return orders if typed else [order.to_dict() for order in orders]
     
     def cancel_order(self, order_id: str) -> Dict[str, Any]:
         """Cancel specific order"""
         params = {'order_id': order_id}
         self._make_request('POST', '/v2/private/order/cancel', params, signed=True)
+        self.invalidate_cache()
         return {'status': 'cancelled', 'order_id': order_id}
     
+    def cancel_orders(self, symbol: str, order_ids: List[str]) -> Dict[str, Any]:
+        """Cancel several orders with one signed v5 request per batch of MAX_BATCH_ORDERS"""
+        symbol = self.normalize_symbol(symbol, 'crypto')
+        
+        cancelled = []
+        errors = []
+        for start in range(0, len(order_ids), self.MAX_BATCH_ORDERS):
+            chunk = order_ids[start:start + self.MAX_BATCH_ORDERS]
+            try:
+                _, ext = self._make_request('POST', '/v5/order/cancel-batch', {
+                    'category': 'linear',
+                    'request': [{'symbol': symbol, 'orderId': order_id} for order_id in chunk],
+                }, signed=True, ext_info=True)
+                statuses = ext.get('list') or []
+            except Exception as e:
+                errors.extend({'order_id': order_id, 'error': str(e)} for order_id in chunk)
+                continue
+            
+            for n, order_id in enumerate(chunk):
+                status = statuses[n] if n < len(statuses) else {}
+                if status.get('code', 0) != 0:
+                    errors.append({'order_id': order_id, 'error': status.get('msg') or 'Cancel rejected'})
+                else:
+                    cancelled.append(order_id)
+        
+        self.invalidate_cache()
+        return {
+            'status': 'success' if not errors else 'partial',
+            'cancelled_count': len(cancelled),
+            'cancelled_orders': cancelled,
+            'errors': errors,
+        }
+    
     def cancel_all_orders(self) -> Dict[str, Any]:
         """Cancel all pending orders"""
         result = self._make_request('POST', '/v2/private/order/cancelAll', signed=True)
+        self.invalidate_cache()
         return {
             'status': 'success',
             'cancelled_count': len(result),
@@ -333,13 +617,17 @@ class BybitBroker(BaseBroker):
     
     def get_market_status(self) -> Dict[str, Any]:
         """Get market status - crypto markets are always open"""
-        now = datetime.now()
-        return {
+        cached = self._cache_get('market_status', self.MARKET_STATUS_CACHE_TTL)
+        if cached is not None:
+            return cached
+        
+        now = datetime.now(timezone.utc)
+        return self._cache_put('market_status', {
             'is_open': True,  # Crypto markets are 24/7
             'next_open': now.isoformat(),
             'next_close': (now + timedelta(days=365)).isoformat(),
             'timestamp': now.isoformat(),
-        }
+        })
     
     # Bybit-specific capabilities
     
@@ -359,13 +647,20 @@ class BybitBroker(BaseBroker):
     
     def normalize_symbol(self, symbol: str, asset_class: str) -> str:
         """Normalize symbol for Bybit (BTCUSDT format for futures)"""
-        if asset_class in ['crypto', 'crypto_futures']:
-            # Remove slashes and ensure USDT suffix
-            symbol = symbol.replace('/', '').replace('-', '')
-            if not symbol.endswith('USDT') and not symbol.endswith('USD'):
-                symbol = symbol + 'USDT'
-            # For futures, might need to add USDT
-            if symbol.endswith('USD') and not symbol.endswith('USDT'):
-                symbol = symbol[:-3] + 'USDT'
+        if asset_class not in ('crypto', 'crypto_futures'):
             return symbol
-        return symbol
+        
+        key = (symbol, asset_class)
+        cached = self._symbol_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Remove slashes/dashes in one pass and ensure USDT suffix
+        normalized = symbol.translate(self._SYMBOL_STRIP)
+        if not normalized.endswith('USDT'):
+            if normalized.endswith('USD'):
+                normalized = normalized[:-3] + 'USDT'
+            else:
+                normalized = normalized + 'USDT'
+        self._symbol_cache[key] = normalized
+        return normalized
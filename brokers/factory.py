@@ -2,95 +2,175 @@
 Broker factory - creates broker instances based on broker type
 """
 
-from typing import Optional
-from .base import BaseBroker
-from .alpaca_broker import AlpacaBroker
-from .bybit_broker import BybitBroker
-from .binance_broker import BinanceBroker
+import functools
+import hashlib
+import importlib
+import json
+import sys
+from enum import IntEnum
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+from .base import BaseBroker, BrokerInfo
 
 
-class BrokerFactory:
-    """Factory class for creating broker instances"""
+class UnsupportedBrokerError(ValueError):
+    """Raised for an unknown broker type; the message is only built if the error is displayed"""
+    __slots__ = ('broker_type',)
     
-    SUPPORTED_BROKERS = {
-        'alpaca': AlpacaBroker,
-        'bybit': BybitBroker,
-        'binance': BinanceBroker,
-    }
+    def __init__(self, broker_type):
+        super().__init__(broker_type)
+        self.broker_type = broker_type
     
-    @classmethod
-    def create_broker(cls, broker_type: str, api_key: str, api_secret: str, 
-                     paper_mode: bool = True) -> BaseBroker:
-        """
-        Create a broker instance
-        
-        Args:
-            broker_type: Type of broker ('alpaca', 'bybit', 'binance')
-            api_key: API key
-            api_secret: API secret
-            paper_mode: Whether to use paper trading mode
-            
-        Returns:
-            BaseBroker: Broker instance
-            
-        Raises:
-            ValueError: If broker type is not supported
-        """
-        broker_type = broker_type.lower().strip()
+    def __str__(self) -> str:
+        return f"Unsupported broker type: {self.broker_type}. Supported brokers: {_SUPPORTED_CSV}"
+
+
+class BrokerKind(IntEnum):
+    """Supported broker types - the value indexes the per-broker tables below"""
+    ALPACA = 0
+    BYBIT = 1
+    BINANCE = 2
+
+
+# (module, class name) per BrokerKind. Modules are imported on first use so only the SDK
+# of the broker actually in use gets loaded.
+_BROKER_SPECS = (
+    ('.alpaca_broker', 'AlpacaBroker'),
+    ('.bybit_broker', 'BybitBroker'),
+    ('.binance_broker', 'BinanceBroker'),
+)
+# Broker type -> (module, class name); read-only so the table can't drift from _BROKER_SPECS
+SUPPORTED_BROKERS = MappingProxyType({kind.name.lower(): _BROKER_SPECS[kind] for kind in BrokerKind})
+# SUPPORTED_BROKERS is static - derive the key list and error text once
+_SUPPORTED_KEYS = tuple(SUPPORTED_BROKERS)
+_SUPPORTED_CSV = ', '.join(SUPPORTED_BROKERS)
+# Common spellings ('binance', 'BINANCE', 'Binance') resolve to a BrokerKind with a single dict probe
+_BROKER_BY_ALIAS = {
+    alias: kind
+    for kind in BrokerKind
+    for alias in (kind.name.lower(), kind.name, kind.name.title())
+}
+# (broker kind, api key, api secret, paper mode) -> broker instance, for create_broker(reuse=True).
+# Assumes one long-lived credential set per broker type, so repeat calls are almost always hits.
+_BROKER_CACHE = {}
+
+
+def _load_broker_class(kind: BrokerKind) -> type:
+    """Import the broker class for a broker kind and install it as that kind's factory"""
+    factory = _FACTORIES[kind]
+    if isinstance(factory, type):
+        return factory
+    module_name, class_name = _BROKER_SPECS[kind]
+    broker_class = getattr(importlib.import_module(module_name, __package__), class_name)
+    _FACTORIES[kind] = broker_class
+    return broker_class
+
+
+def _lazy_factory(kind: BrokerKind):
+    """First-call factory for a broker kind: imports the class, which then replaces it"""
+    def make(api_key: str, api_secret: str, paper_mode: bool) -> BaseBroker:
+        return _load_broker_class(kind)(api_key, api_secret, paper_mode)
+    return make
+
+
+# Constructor per BrokerKind, called as factory(api_key, api_secret, paper_mode). Starts as a
+# lazy-import thunk and becomes the broker class itself after first use - no branching per call.
+_FACTORIES = [_lazy_factory(kind) for kind in BrokerKind]
+
+
+def _resolve_kind(broker_type) -> BrokerKind:
+    """Slow path for broker types the alias table missed: accept a BrokerKind or normalize the string"""
+    if isinstance(broker_type, BrokerKind):
+        return broker_type
+    # Interned so the lookup below compares against the (interned) literal keys by pointer
+    normalized = sys.intern(broker_type.strip().lower()) if isinstance(broker_type, str) else ''
+    kind = _BROKER_BY_ALIAS.get(normalized)
+    if kind is None:
+        raise UnsupportedBrokerError(broker_type)
+    return kind
+
+
+def create_broker(broker_type: str, api_key: str, api_secret: str,
+                  paper_mode: bool = True, reuse: bool = True) -> BaseBroker:
+    """
+    Create a broker instance
+    
+    Args:
+        broker_type: Type of broker ('alpaca', 'bybit', 'binance') or a BrokerKind
+        api_key: API key
+        api_secret: API secret
+        paper_mode: Whether to use paper trading mode
+        reuse: Return the existing instance for the same broker and credentials
+               instead of building a new one (skips client setup and warm-up)
         
-        if broker_type not in cls.SUPPORTED_BROKERS:
-            supported = ', '.join(cls.SUPPORTED_BROKERS.keys())
-            raise ValueError(
-                f"Unsupported broker type: {broker_type}. "
-                f"Supported brokers: {supported}"
-            )
+    Returns:
+        BaseBroker: Broker instance
         
-        broker_class = cls.SUPPORTED_BROKERS[broker_type]
-        return broker_class(api_key=api_key, api_secret=api_secret, paper_mode=paper_mode)
+    Raises:
+        UnsupportedBrokerError: If broker type is not supported (a ValueError)
+    """
+    # Happy path: an already-normalized (or common-cased) key needs no string work at all
+    kind = _BROKER_BY_ALIAS.get(broker_type)
+    if kind is None:
+        kind = _resolve_kind(broker_type)
+    
+    if not reuse:
+        return _FACTORIES[kind](api_key, api_secret, paper_mode)
+    
+    key = (kind, api_key, api_secret, paper_mode)
+    broker = _BROKER_CACHE.get(key)
+    if broker is None:
+        broker = _FACTORIES[kind](api_key, api_secret, paper_mode)
+        _BROKER_CACHE[key] = broker
+    return broker
+
+
+def get_supported_brokers() -> Tuple[str, ...]:
+    """Get the supported broker types"""
+    return _SUPPORTED_KEYS
+
+
+@functools.cache
+def get_broker_info() -> Mapping[str, BrokerInfo]:
+    """
+    Get information about each supported broker (read-only view; use info.to_dict() for a dict).
+    The metadata lives on each broker class as INFO, so the first call imports the broker modules.
+    """
+    return MappingProxyType({kind.name.lower(): _load_broker_class(kind).INFO for kind in BrokerKind})
+
+
+@functools.cache
+def get_broker_info_json() -> bytes:
+    """get_broker_info() serialized once to UTF-8 JSON, for serving over HTTP without re-encoding"""
+    return json.dumps({name: info.to_dict() for name, info in get_broker_info().items()}).encode('utf-8')
+
+
+@functools.cache
+def get_broker_info_etag() -> str:
+    """Stable ETag for get_broker_info_json(), so clients can revalidate with If-None-Match"""
+    return hashlib.blake2b(get_broker_info_json(), digest_size=8).hexdigest()
+
+
+class BrokerFactory:
+    """
+    Factory class for creating broker instances.
+    Kept for backwards compatibility - the module-level functions skip the attribute lookup.
+    
+    BrokerFactory['binance'] returns the broker class itself, so
+    BrokerFactory['binance'](api_key, api_secret, paper_mode) constructs without the reuse memo.
+    """
+    
+    __slots__ = ()
+    
+    SUPPORTED_BROKERS = SUPPORTED_BROKERS
     
-    @classmethod
-    def get_supported_brokers(cls) -> list:
-        """Get list of supported broker types"""
-        return list(cls.SUPPORTED_BROKERS.keys())
+    create_broker = staticmethod(create_broker)
+    get_supported_brokers = staticmethod(get_supported_brokers)
+    get_broker_info = staticmethod(get_broker_info)
+    get_broker_info_json = staticmethod(get_broker_info_json)
     
-    @classmethod
-    def get_broker_info(cls) -> dict:
-        """Get information about each supported broker"""
-        return {
-            'alpaca': {
-                'name': 'Alpaca',
-                'description': 'US-based broker supporting stocks, crypto, and options',
-                'supports_stocks': True,
-                'supports_crypto': True,
-                'supports_options': True,
-                'supports_leverage': True,
-                'max_crypto_leverage': 1,
-                'max_stock_leverage': 2,
-                'paper_trading': True,
-                'website': 'https://alpaca.markets',
-            },
-            'bybit': {
-                'name': 'Bybit',
-                'description': 'Crypto exchange with perpetual futures and up to 100x leverage',
-                'supports_stocks': False,
-                'supports_crypto': True,
-                'supports_options': False,
-                'supports_leverage': True,
-                'max_crypto_leverage': 100,
-                'max_stock_leverage': 0,
-                'paper_trading': True,
-                'website': 'https://www.bybit.com',
-            },
-            'binance': {
-                'name': 'Binance',
-                'description': 'Largest crypto exchange with spot and futures trading (up to 125x leverage)',
-                'supports_stocks': False,
-                'supports_crypto': True,
-                'supports_options': False,
-                'supports_leverage': True,
-                'max_crypto_leverage': 125,
-                'max_stock_leverage': 0,
-                'paper_trading': True,
-                'website': 'https://www.binance.com',
-            },
-        }
+    def __class_getitem__(cls, broker_type: str) -> type:
+        kind = _BROKER_BY_ALIAS.get(broker_type)
+        if kind is None:
+            kind = _resolve_kind(broker_type)
+        return _load_broker_class(kind)
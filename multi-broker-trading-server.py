@@ -4,29 +4,48 @@ Multi-Broker Trading Server
 Supports: Alpaca, Bybit, Binance with leverage trading
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
+import io
 import os
 import sys
 import json
 import logging
 import threading
 import time
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Any, Optional
 from anthropic import Anthropic
 from openai import OpenAI
 import yfinance as yf
-import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
 import numpy as np
 
 # Add brokers directory to path
 sys.path.insert(0, os.path.dirname(__file__))
 
+from _njit import njit
+
+try:
+    import orjson
+    
+    def _dumps_tool_result(result):
+        """Serialize a tool result to the str content the AI SDKs expect"""
+        return orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:  # orjson is optional - stdlib json produces the same payloads, just slower
+    def _dumps_tool_result(result):
+        """Serialize a tool result to the str content the AI SDKs expect"""
+        return json.dumps(result)
+
 # Import broker abstraction
 from broker_adapter import (
     initialize_broker,
     get_current_broker,
-    get_broker_info,
+    get_brokers_payload,
     get_supported_brokers
 )
 
@@ -40,89 +59,221 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
-# Global state
-broker = None
-anthropic_client = None
-openai_client = None
-ai_model = "claude"
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Broker and AI clients in use, swapped as a whole by /api/initialize"""
+    broker: Any = None
+    anthropic_client: Optional[Anthropic] = None
+    openai_client: Optional[OpenAI] = None
+    ai_model: str = "claude"
+
+# Global state - readers take one snapshot (cfg = _config) so they never see a half-applied initialize
+_config = Config()
 
 # Auto-trading state
 autotrading_active = False
 autotrading_thread = None
 autotrading_config = None
-autotrading_logs = []
+autotrading_logs = deque(maxlen=500)  # oldest entries fall off automatically
 autotrading_markets = []  # Store Polymarket data
-conversation_history = []
+# Chat transcript: the pinned system prompt plus a bounded tail of turns
+_system_msg = None
+conversation_history = deque(maxlen=19)
+# Guards conversation_history across concurrent /api/chat requests (not held during the AI call)
+_history_lock = threading.Lock()
 
 def add_autotrading_log(message, log_type="info"):
     """Add a log entry for auto-trading"""
-    global autotrading_logs
     log_entry = {
         "timestamp": datetime.now().isoformat(),
         "message": message,
         "type": log_type
     }
     autotrading_logs.append(log_entry)
-    if len(autotrading_logs) > 500:
-        autotrading_logs = autotrading_logs[-500:]
     logger.info(f"Auto-trading: {message}")
 
 # Technical analysis functions
-def calculate_rsi(prices, period=14):
-    """Calculate RSI indicator"""
-    if len(prices) < period + 1:
-        return None
+class RollingBB:
+    """
+    Streaming Bollinger Bands: O(1) per price via running sum / sum of squares over a
+    deque(maxlen=period). Sums are rebuilt from the window every RECOMPUTE_EVERY pushes
+    so floating-point drift can't accumulate.
+    """
+    RECOMPUTE_EVERY = 10_000
     
-    deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-    gains = [d if d > 0 else 0 for d in deltas]
-    losses = [-d if d < 0 else 0 for d in deltas]
+    def __init__(self, period=20, std_dev=2):
+        self.period = period
+        self.std_dev = std_dev
+        self.window = deque(maxlen=period)
+        self.sum_x = 0.0
+        self.sum_x2 = 0.0
+        self.pushes = 0
     
-    avg_gain = sum(gains[:period]) / period
-    avg_loss = sum(losses[:period]) / period
+    def push(self, x):
+        """Add a price; returns (upper, middle, lower) once the window is full, else (None, None, None)"""
+        x = float(x)
+        if len(self.window) == self.period:
+            oldest = self.window[0]
+            self.sum_x -= oldest
+            self.sum_x2 -= oldest * oldest
+        self.window.append(x)
+        self.sum_x += x
+        self.sum_x2 += x * x
+        
+        self.pushes += 1
+        if self.pushes % self.RECOMPUTE_EVERY == 0:
+            self.sum_x = sum(self.window)
+            self.sum_x2 = sum(v * v for v in self.window)
+        
+        n = len(self.window)
+        if n < self.period:
+            return None, None, None
+        mean = self.sum_x / n
+        std = max(self.sum_x2 / n - mean * mean, 0.0) ** 0.5
+        return mean + std * self.std_dev, mean, mean - std * self.std_dev
+
+# One RollingBB per (symbol, period, std_dev), reused across ticks
+_rolling_bbands = {}
+
+def update_rolling_bbands(symbol, price, period=20, std_dev=2):
+    """Push the latest price for symbol and return its current (upper, middle, lower) bands"""
+    key = (symbol, period, std_dev)
+    bands = _rolling_bbands.get(key)
+    if bands is None:
+        bands = _rolling_bbands[key] = RollingBB(period, std_dev)
+    return bands.push(price)
+
+@njit(cache=True)
+def _indicators_kernel(prices, rsi_n, fast, slow, sig, bb_n):
+    """
+    RSI, MACD and Bollinger inputs in one pass over prices. EMAs use the recursive form of
+    pandas' adjust=True EWM (weighted sum / weight sum), the band a Welford mean/M2 over the
+    last bb_n prices. Returns (rsi, macd, signal, bb_mean, bb_std); callers check the lengths.
     
-    for i in range(period, len(gains)):
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+    EMAs assume evenly spaced bars (constant decay). Don't switch to pandas ewm(times=...)
+    for irregular bars - its time-weighted path has been O(n^2) in some releases (pandas
+    #39784, fixed by #43052); use a per-step decay of exp(-dt / tau) in this loop instead.
+    """
+    n = len(prices)
+    d_fast = 1.0 - 2.0 / (fast + 1)
+    d_slow = 1.0 - 2.0 / (slow + 1)
+    d_sig = 1.0 - 2.0 / (sig + 1)
+    num_fast = den_fast = num_slow = den_slow = num_sig = den_sig = 0.0
+    macd = 0.0
+    avg_gain = avg_loss = 0.0
+    bb_mean = bb_m2 = 0.0
+    bb_count = 0
+    bb_start = n - bb_n
     
-    if avg_loss == 0:
-        return 100
+    for i in range(n):
+        x = prices[i]
+        
+        num_fast = x + d_fast * num_fast
+        den_fast = 1.0 + d_fast * den_fast
+        num_slow = x + d_slow * num_slow
+        den_slow = 1.0 + d_slow * den_slow
+        macd = num_fast / den_fast - num_slow / den_slow
+        num_sig = macd + d_sig * num_sig
+        den_sig = 1.0 + d_sig * den_sig
+        
+        if i > 0:
+            d = x - prices[i - 1]
+            gain = d if d > 0 else 0.0
+            loss = -d if d < 0 else 0.0
+            if i <= rsi_n:
+                avg_gain += gain
+                avg_loss += loss
+                if i == rsi_n:
+                    avg_gain /= rsi_n
+                    avg_loss /= rsi_n
+            else:
+                avg_gain = (avg_gain * (rsi_n - 1) + gain) / rsi_n
+                avg_loss = (avg_loss * (rsi_n - 1) + loss) / rsi_n
+        
+        if i >= bb_start:
+            bb_count += 1
+            delta = x - bb_mean
+            bb_mean += delta / bb_count
+            bb_m2 += delta * (x - bb_mean)
     
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return round(rsi, 2)
+    rsi = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    bb_std = (bb_m2 / bb_count) ** 0.5 if bb_count else 0.0
+    return rsi, macd, num_sig / den_sig if n else 0.0, bb_mean, bb_std
 
-def calculate_macd(prices, fast=12, slow=26, signal=9):
-    """Calculate MACD indicator"""
-    if len(prices) < slow:
-        return None, None, None
-    
-    ema_fast = pd.Series(prices).ewm(span=fast).mean().iloc[-1]
-    ema_slow = pd.Series(prices).ewm(span=slow).mean().iloc[-1]
-    macd_line = ema_fast - ema_slow
+def calculate_indicators(prices, rsi_period=14, fast=12, slow=26, signal=9, bb_period=20, bb_std_dev=2):
+    """
+    Calculate RSI, MACD and Bollinger Bands together in one pass
+    Returns (rsi, (macd, signal, histogram), (upper, middle, lower)); each is None (or a
+    tuple of Nones) when there are too few prices for its period
+    """
+    n = len(prices)
+    rsi, macd_line, signal_line, sma, std = map(float, _indicators_kernel(
+        np.asarray(prices, dtype=np.float64), rsi_period, fast, slow, signal, bb_period))
     
-    macd_values = pd.Series(prices).ewm(span=fast).mean() - pd.Series(prices).ewm(span=slow).mean()
-    signal_line = macd_values.ewm(span=signal).mean().iloc[-1]
-    histogram = macd_line - signal_line
-    
-    return round(macd_line, 4), round(signal_line, 4), round(histogram, 4)
+    rsi = rsi if n >= rsi_period + 1 else None
+    if n >= slow:
+        macd = (macd_line, signal_line, macd_line - signal_line)
+    else:
+        macd = (None, None, None)
+    if n >= bb_period:
+        bands = (sma + std * bb_std_dev, sma, sma - std * bb_std_dev)
+    else:
+        bands = (None, None, None)
+    return rsi, macd, bands
+
+# Keep-alive pool shared by every yfinance lookup so repeat fetches skip the TLS handshake
+_http_session = requests.Session()
+_http_session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=64))
+
+def _round_opt(value, ndigits):
+    """round() that passes None through (indicators are None when history is too short)"""
+    return None if value is None else round(value, ndigits)
+
+# Quote-currency suffixes that mark a symbol as crypto (one str.endswith call)
+_CRYPTO_SUFFIXES = ('USDT', 'USD', 'USDC', 'BUSD')
 
-def calculate_bollinger_bands(prices, period=20, std_dev=2):
-    """Calculate Bollinger Bands"""
-    if len(prices) < period:
-        return None, None, None
+# Close-price history cache: key -> (monotonic expiry, float64 array of closes)
+_price_history_cache = {}
+
+# How long a fetched history stays fresh, by bar interval (seconds)
+_HISTORY_TTL = {
+    '1m': 30, '2m': 30, '5m': 30, '15m': 30, '30m': 60,
+    '60m': 300, '90m': 300, '1h': 300,
+    '1d': 3600, '5d': 3600, '1wk': 3600, '1mo': 3600,
+}
+
+def get_close_prices(symbol, timeframe, is_crypto):
+    """
+    Close prices for the technical indicators as a float64 array, cached per symbol/timeframe
+    so repeat tool calls within the TTL skip the network round-trip
+    """
+    broker = _config.broker
+    if is_crypto:
+        # Daily bars from the active broker
+        key = ('broker', broker.get_broker_name(), symbol)
+        ttl = _HISTORY_TTL['1d']
+    else:
+        key = ('yfinance', symbol, timeframe)
+        ttl = _HISTORY_TTL.get(timeframe, 60)
     
-    recent_prices = prices[-period:]
-    sma = sum(recent_prices) / period
-    variance = sum((x - sma) ** 2 for x in recent_prices) / period
-    std = variance ** 0.5
+    now = time.monotonic()
+    cached = _price_history_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
     
-    upper = sma + (std * std_dev)
-    lower = sma - (std * std_dev)
+    if is_crypto:
+        start = datetime.now() - timedelta(days=30)
+        bars = broker.get_stock_bars(symbol, "1Day", start, limit=100)
+        prices = np.fromiter((b['close'] for b in bars), dtype=np.float64, count=len(bars))
+    else:
+        hist = yf.Ticker(symbol, session=_http_session).history(period="1mo", interval=timeframe)
+        prices = hist['Close'].to_numpy(dtype=np.float64, copy=False)
     
-    return round(upper, 2), round(sma, 2), round(lower, 2)
+    _price_history_cache[key] = (now + ttl, prices)
+    return prices
 
 # Tool definitions with leverage support
-TOOLS = [
+TOOLS = (
     {
         "name": "get_account",
         "description": "Get account information (balance, equity, buying power, etc.)",
@@ -294,11 +445,26 @@ TOOLS = [
         "description": "Clear all trading memory",
         "input_schema": {"type": "object", "properties": {}, "required": []}
     }
-]
+)
+
+# Read-only tools that are safe to run concurrently within one AI turn.
+# Order-placing and memory tools mutate shared state and always run in sequence.
+_PARALLEL_SAFE_TOOLS = frozenset({
+    "get_account",
+    "get_all_positions",
+    "get_crypto_latest_bar",
+    "get_stock_quote",
+    "get_stock_bars",
+    "get_technical_indicators",
+    "get_orders",
+    "get_market_clock",
+})
+
+_tool_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tool")
 
 def execute_tool(tool_name, arguments):
     """Execute a trading tool using broker abstraction"""
-    global broker
+    broker = _config.broker
     
     if not broker:
         return {"error": "Broker not initialized. Please configure broker credentials in Settings."}
@@ -385,39 +551,29 @@ def execute_tool(tool_name, arguments):
             timeframe = arguments.get("timeframe", "1d")
             
             # Determine if it's crypto or stock
-            is_crypto = '/' in symbol or symbol.endswith('USDT') or symbol.endswith('USD')
+            is_crypto = '/' in symbol or symbol.endswith(_CRYPTO_SUFFIXES)
             
             try:
-                if is_crypto:
-                    # Use broker's historical data
-                    from datetime import datetime, timedelta
-                    start = datetime.now() - timedelta(days=30)
-                    bars = broker.get_stock_bars(symbol, "1Day", start, limit=100)
-                    prices = [b['close'] for b in bars]
-                else:
-                    # Use Yahoo Finance for stocks
-                    ticker = yf.Ticker(symbol)
-                    hist = ticker.history(period="1mo", interval=timeframe)
-                    prices = hist['Close'].tolist()
+                # Broker's historical data for crypto, Yahoo Finance for stocks
+                prices = get_close_prices(symbol, timeframe, is_crypto)
                 
                 if len(prices) < 20:
                     return {"error": f"Insufficient data for {symbol}"}
                 
                 # Calculate indicators
-                rsi = calculate_rsi(prices)
-                macd, signal, histogram = calculate_macd(prices)
-                upper_bb, middle_bb, lower_bb = calculate_bollinger_bands(prices)
+                rsi, (macd, signal, histogram), (upper_bb, middle_bb, lower_bb) = calculate_indicators(prices)
                 
-                current_price = prices[-1]
+                current_price = float(prices[-1])
                 
+                # Indicators stay full precision; round once here for display
                 return {
                     "symbol": symbol,
                     "current_price": round(current_price, 2),
-                    "rsi": rsi,
+                    "rsi": _round_opt(rsi, 2),
                     "rsi_signal": "Oversold" if rsi and rsi < 30 else "Overbought" if rsi and rsi > 70 else "Neutral",
-                    "macd": {"line": macd, "signal": signal, "histogram": histogram},
+                    "macd": {"line": _round_opt(macd, 4), "signal": _round_opt(signal, 4), "histogram": _round_opt(histogram, 4)},
                     "macd_signal": "Bullish" if histogram and histogram > 0 else "Bearish",
-                    "bollinger_bands": {"upper": upper_bb, "middle": middle_bb, "lower": lower_bb},
+                    "bollinger_bands": {"upper": _round_opt(upper_bb, 2), "middle": _round_opt(middle_bb, 2), "lower": _round_opt(lower_bb, 2)},
                     "bb_signal": "Near Upper Band" if current_price > middle_bb else "Near Lower Band"
                 }
             except Exception as e:
@@ -442,11 +598,18 @@ def execute_tool(tool_name, arguments):
         elif tool_name == "read_trading_memory":
             memory_file = "trading_memory.md"
             if os.path.exists(memory_file):
+                numbered = io.StringIO()
+                line_count = 0
+                last = "\n"
                 with open(memory_file, "r") as f:
-                    content = f.read()
-                lines = content.split("\n")
-                numbered = "\n".join([f"{i+1}: {line}" for i, line in enumerate(lines)])
-                return {"content": numbered, "line_count": len(lines)}
+                    for line_count, last in enumerate(f, 1):
+                        numbered.write(f"{line_count}: ")
+                        numbered.write(last)
+                # A trailing newline (or empty file) still counts as one more, empty line
+                if last.endswith("\n"):
+                    line_count += 1
+                    numbered.write(f"{line_count}: ")
+                return {"content": numbered.getvalue(), "line_count": line_count}
             return {"content": "", "line_count": 0}
         
         elif tool_name == "write_trading_memory":
@@ -476,6 +639,45 @@ def execute_tool(tool_name, arguments):
         return {"error": str(e)}
 
 # AI conversation functions
+def _execute_tool_logged(tool_name, tool_input):
+    """Run one tool, mirroring the call and its result into the auto-trading log"""
+    # Log tool usage for auto-trading
+    if autotrading_active:
+        add_autotrading_log(f"🔧 Using tool: {tool_name}({json.dumps(tool_input)[:100]}...)", "tool")
+    
+    result = execute_tool(tool_name, tool_input)
+    
+    # Log tool result for auto-trading
+    if autotrading_active:
+        result_json = _dumps_tool_result(result)
+        add_autotrading_log(f"✅ Tool result: {result_json[:500]}{'...' if len(result_json) > 500 else ''}", "tool_result")
+    
+    return result
+
+def execute_tools(calls):
+    """Execute a turn's tool calls, overlapping runs of consecutive read-only ones.
+    
+    A stateful tool waits for the reads emitted before it, and reads emitted after it
+    start only once it returns, so every call sees the state the model's order implies.
+    
+    Args:
+        calls: List of (tool_name, tool_input) pairs in the order the model emitted them
+    
+    Returns:
+        List of results in the same order as calls
+    """
+    results = []
+    pending = []  # Futures for the current run of read-only calls
+    for name, args in calls:
+        if name in _PARALLEL_SAFE_TOOLS:
+            pending.append(_tool_pool.submit(_execute_tool_logged, name, args))
+            continue
+        results.extend(future.result() for future in pending)
+        pending = []
+        results.append(_execute_tool_logged(name, args))
+    results.extend(future.result() for future in pending)
+    return results
+
 def convert_tools_to_openai_format():
     """Convert tools to OpenAI format for DeepSeek"""
     openai_tools = []
@@ -490,18 +692,21 @@ def convert_tools_to_openai_format():
         })
     return openai_tools
 
+# TOOLS never changes at runtime, so the DeepSeek payload is built once
+OPENAI_TOOLS = tuple(convert_tools_to_openai_format())
+
 def call_ai_with_tools(messages_for_ai, max_turns=10):
     """Call AI (Claude or DeepSeek) with tool support"""
-    global ai_model, anthropic_client, openai_client
+    cfg = _config
     
-    if ai_model == "claude" and anthropic_client:
-        return _call_claude_with_tools(messages_for_ai, max_turns)
-    elif ai_model == "deepseek" and openai_client:
-        return _call_deepseek_with_tools(messages_for_ai, max_turns)
+    if cfg.ai_model == "claude" and cfg.anthropic_client:
+        return _call_claude_with_tools(cfg.anthropic_client, messages_for_ai, max_turns)
+    elif cfg.ai_model == "deepseek" and cfg.openai_client:
+        return _call_deepseek_with_tools(cfg.openai_client, messages_for_ai, max_turns)
     else:
         return "AI client not initialized. Please configure API keys in Settings."
 
-def _call_claude_with_tools(messages, max_turns):
+def _call_claude_with_tools(anthropic_client, messages, max_turns):
     """Claude-specific tool calling"""
     for turn in range(max_turns):
         response = anthropic_client.messages.create(
@@ -518,43 +723,30 @@ def _call_claude_with_tools(messages, max_turns):
         if response.stop_reason == "tool_use":
             messages.append({"role": "assistant", "content": response.content})
             
-            tool_results = []
-            for block in response.content:
-                if block.type == "tool_use":
-                    tool_name = block.name
-                    tool_input = block.input
-                    
-                    # Log tool usage for auto-trading
-                    if autotrading_active:
-                        add_autotrading_log(f"🔧 Using tool: {tool_name}({json.dumps(tool_input)[:100]}...)", "tool")
-                    
-                    result = execute_tool(tool_name, tool_input)
-                    
-                    # Log tool result for auto-trading
-                    if autotrading_active:
-                        result_str = json.dumps(result)[:500]
-                        add_autotrading_log(f"✅ Tool result: {result_str}{'...' if len(json.dumps(result)) > 500 else ''}", "tool_result")
-                    
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "content": json.dumps(result)
-                    })
+            tool_blocks = [block for block in response.content if block.type == "tool_use"]
+            results = execute_tools([(block.name, block.input) for block in tool_blocks])
+            
+            tool_results = [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": block.id,
+                    "content": _dumps_tool_result(result)
+                }
+                for block, result in zip(tool_blocks, results)
+            ]
             
             messages.append({"role": "user", "content": tool_results})
             continue
     
     return "Max turns reached."
 
-def _call_deepseek_with_tools(messages, max_turns):
+def _call_deepseek_with_tools(openai_client, messages, max_turns):
     """DeepSeek-specific tool calling"""
-    openai_tools = convert_tools_to_openai_format()
-    
     for turn in range(max_turns):
         response = openai_client.chat.completions.create(
             model="deepseek-chat",
             messages=messages,
-            tools=openai_tools,
+            tools=OPENAI_TOOLS,
             tool_choice="auto"
         )
         
@@ -565,25 +757,16 @@ def _call_deepseek_with_tools(messages, max_turns):
         
         messages.append(message)
         
-        for tool_call in message.tool_calls:
-            tool_name = tool_call.function.name
-            tool_args = json.loads(tool_call.function.arguments)
-            
-            # Log tool usage for auto-trading
-            if autotrading_active:
-                add_autotrading_log(f"🔧 Using tool: {tool_name}({json.dumps(tool_args)[:100]}...)", "tool")
-            
-            result = execute_tool(tool_name, tool_args)
-            
-            # Log tool result for auto-trading
-            if autotrading_active:
-                result_str = json.dumps(result)[:500]
-                add_autotrading_log(f"✅ Tool result: {result_str}{'...' if len(json.dumps(result)) > 500 else ''}", "tool_result")
-            
+        results = execute_tools([
+            (tool_call.function.name, json.loads(tool_call.function.arguments))
+            for tool_call in message.tool_calls
+        ])
+        
+        for tool_call, result in zip(message.tool_calls, results):
             messages.append({
                 "role": "tool",
                 "tool_call_id": tool_call.id,
-                "content": json.dumps(result)
+                "content": _dumps_tool_result(result)
             })
     
     return "Max turns reached."
@@ -593,6 +776,7 @@ def _call_deepseek_with_tools(messages, max_turns):
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check"""
+    broker = _config.broker
     broker_name = broker.get_broker_name() if broker else "None"
     return jsonify({
         "status": "healthy",
@@ -602,16 +786,16 @@ def health_check():
 
 @app.route('/api/brokers', methods=['GET'])
 def get_brokers():
-    """Get supported brokers and their info"""
-    return jsonify({
-        'brokers': get_broker_info(),
-        'supported': get_supported_brokers()
-    })
+    """Get supported brokers and their info (static, so served pre-encoded with an ETag)"""
+    body, etag = get_brokers_payload()
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
 
 @app.route('/api/initialize', methods=['POST'])
 def initialize():
     """Initialize with broker and API keys"""
-    global broker, anthropic_client, openai_client, ai_model, conversation_history
+    global _config, _system_msg
     
     data = request.json
     
@@ -648,18 +832,26 @@ def initialize():
             api_secret=broker_secret,
             paper_mode=paper_mode
         )
+        # Open the broker's API connections in the background, off this request
+        _tool_pool.submit(broker.warm_up)
         
-        # Initialize AI clients
+        # Initialize AI clients (a client for the other model is kept from the previous config)
         ai_model = selected_model
+        cfg = replace(_config, broker=broker, ai_model=ai_model)
         if ai_model == 'claude' and claude_key:
-            anthropic_client = Anthropic(api_key=claude_key)
+            cfg = replace(cfg, anthropic_client=Anthropic(api_key=claude_key))
         elif ai_model == 'deepseek' and deepseek_key:
-            openai_client = OpenAI(
+            cfg = replace(cfg, openai_client=OpenAI(
                 api_key=deepseek_key,
                 base_url="https://api.deepseek.com/v1"
-            )
+            ))
+        
+        # Publish broker and clients in a single assignment
+        _config = cfg
         
-        conversation_history = []
+        with _history_lock:
+            _system_msg = None
+            conversation_history.clear()
         
         broker_name = broker.get_broker_name()
         max_leverage = broker.get_max_leverage('crypto')
@@ -682,6 +874,7 @@ def initialize():
 @app.route('/api/account', methods=['GET'])
 def get_account():
     """Get account info"""
+    broker = _config.broker
     if not broker:
         return jsonify({"error": "Broker not initialized"}), 400
     
@@ -694,6 +887,7 @@ def get_account():
 @app.route('/api/positions', methods=['GET'])
 def get_positions():
     """Get positions"""
+    broker = _config.broker
     if not broker:
         return jsonify({"error": "Broker not initialized"}), 400
     
@@ -706,8 +900,9 @@ def get_positions():
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """Chat with AI trader"""
-    global conversation_history
+    global _system_msg
     
+    broker = _config.broker
     if not broker:
         return jsonify({"error": "Broker not initialized"}), 400
     
@@ -739,19 +934,21 @@ Always provide helpful trading advice and execute requested trades."""
     
     try:
         # Build conversation
-        if not conversation_history:
-            conversation_history.append({"role": "user", "content": system_message})
-        
-        conversation_history.append({"role": "user", "content": user_message})
+        with _history_lock:
+            if _system_msg is None:
+                _system_msg = {"role": "user", "content": system_message}
+            
+            conversation_history.append({"role": "user", "content": user_message})
+            messages_for_ai = [_system_msg, *conversation_history]
+        turn_start = len(messages_for_ai)
         
         # Call AI
-        response_text = call_ai_with_tools(conversation_history, max_turns=10)
+        response_text = call_ai_with_tools(messages_for_ai, max_turns=10)
         
-        conversation_history.append({"role": "assistant", "content": response_text})
-        
-        # Keep conversation history manageable
-        if len(conversation_history) > 20:
-            conversation_history = [conversation_history[0]] + conversation_history[-19:]
+        # Keep the tool_use/tool_result exchange in history; the deque drops the oldest turns
+        with _history_lock:
+            conversation_history.extend(messages_for_ai[turn_start:])
+            conversation_history.append({"role": "assistant", "content": response_text})
         
         return jsonify({"response": response_text})
         
@@ -767,6 +964,7 @@ def start_autotrading():
     if autotrading_active:
         return jsonify({"error": "Auto-trading already active"}), 400
     
+    broker = _config.broker
     if not broker:
         return jsonify({"error": "Broker not initialized"}), 400
     
@@ -809,31 +1007,36 @@ def autotrading_status():
 @app.route('/api/autotrading/logs', methods=['GET'])
 def autotrading_logs_endpoint():
     """Get auto-trading logs"""
-    return jsonify({"logs": autotrading_logs})
+    return jsonify({"logs": list(autotrading_logs)})
 
 @app.route('/api/autotrading/logs/clear', methods=['POST'])
 def clear_autotrading_logs():
     """Clear auto-trading logs"""
-    global autotrading_logs
-    autotrading_logs = []
+    autotrading_logs.clear()
     return jsonify({"success": True})
 
 def autotrading_loop():
     """Auto-trading main loop"""
-    global autotrading_active, autotrading_config, autotrading_markets, conversation_history
+    global autotrading_active, autotrading_config, autotrading_markets
     
-    add_autotrading_log(f"🤖 Auto-trading loop started with {broker.get_broker_name()}", "success")
+    add_autotrading_log(f"🤖 Auto-trading loop started with {_config.broker.get_broker_name()}", "success")
     
     iteration = 0
+    # Bands from an earlier run were sampled at a different interval - start fresh
+    _rolling_bbands.clear()
     while autotrading_active:
         try:
             iteration += 1
+            # Pick up a broker switched via /api/initialize at the start of each cycle
+            broker = _config.broker
             add_autotrading_log(f"═══ Cycle #{iteration} Starting ═══", "info")
             
             # Get account info
             add_autotrading_log("📊 Fetching account data...", "info")
+            # Independent broker round-trips - overlap them on the tool pool
+            positions_future = _tool_pool.submit(broker.get_positions)
             account = broker.get_account()
-            positions = broker.get_positions()
+            positions = positions_future.result()
             
             cash = account.get('cash', 0)
             equity = account.get('equity', 0) or account.get('portfolio_value', 0)
@@ -866,7 +1069,20 @@ def autotrading_loop():
                     symbol = pos.get('symbol', 'Unknown')
                     qty = pos.get('qty', 0)
                     unrealized_pl = pos.get('unrealized_pl', 0)
-                    positions_context += f"- {symbol}: {qty} units, P&L: ${unrealized_pl:.2f}\n"
+                    positions_context += f"- {symbol}: {qty} units, P&L: ${unrealized_pl:.2f}"
+                    
+                    # Bands over this symbol's price at each cycle, updated in O(1)
+                    current_price = pos.get('current_price')
+                    if current_price:
+                        upper, middle, lower = update_rolling_bbands(symbol, current_price)
+                        if middle is not None:
+                            positions_context += f", Bollinger (last 20 cycles): {lower:.2f} / {middle:.2f} / {upper:.2f}"
+                    positions_context += "\n"
+            
+            # Forget bands for positions that have been closed
+            held = {pos.get('symbol') for pos in positions}
+            for key in [key for key in _rolling_bbands if key[0] not in held]:
+                del _rolling_bbands[key]
             
             # Build comprehensive trading context
             context = f"""═══════════════════════════════════════════════════════════
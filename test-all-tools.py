@@ -4,181 +4,220 @@ Comprehensive test script for all 17 trading tools
 Tests live Alpaca endpoints to ensure everything works
 """
 
+import asyncio
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import sys
 import time
+from collections import namedtuple
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional - stdlib json gives the same results, just slower
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
+    _json_loads = json.loads
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Outcome of one chat probe: ok is True for a non-empty AI response, payload is
+# the response text on success or the error message otherwise
+ChatResult = namedtuple("ChatResult", "ok payload")
+
 SERVER_URL = "http://localhost:5001"
 
+# Option expiry used by the options probe, fixed for the whole run
+NEXT_MONTH_ISO = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+
+# Keep-alive session for the synchronous setup requests
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=0))
+
+# Lines queued by print_test until the current test category calls flush_output()
+_BUF = []
+
 def print_test(category, test_name, passed=None, details=""):
-    """Print formatted test result"""
+    """Queue a formatted test result (written out by flush_output)"""
     if passed is None:
-        print(f"\n{'='*60}")
-        print(f"🧪 {category}")
-        print(f"{'='*60}")
+        _BUF.append(f"\n{'='*60}")
+        _BUF.append(f"🧪 {category}")
+        _BUF.append(f"{'='*60}")
     elif passed:
-        print(f"✅ {test_name}")
+        _BUF.append(f"✅ {test_name}")
         if details:
-            print(f"   {details}")
+            _BUF.append(f"   {details}")
     else:
-        print(f"❌ {test_name}")
+        _BUF.append(f"❌ {test_name}")
         if details:
-            print(f"   ERROR: {details}")
+            _BUF.append(f"   ERROR: {details}")
+
+def flush_output():
+    """Write all queued results in a single call"""
+    if _BUF:
+        _BUF.append("")
+        sys.stdout.write("\n".join(_BUF))
+        sys.stdout.flush()
+        _BUF.clear()
 
-def send_chat_message(message):
+async def send_chat_message(session, message):
     """Send a message to the chat endpoint"""
     try:
-        response = requests.post(
+        async with session.post(
             f"{SERVER_URL}/api/chat",
-            json={"message": message},
-            timeout=30
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return {"error": f"HTTP {response.status_code}: {response.text}"}
+            data=_json_dumps({"message": message}),
+            headers=JSON_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status == 200:
+                body = await response.json(loads=_json_loads)
+                if "error" in body:
+                    return ChatResult(False, body["error"])
+                reply = body.get("response")
+                return ChatResult(True, reply) if reply else ChatResult(False, "Unknown error")
+            else:
+                return ChatResult(False, f"HTTP {response.status}: {await response.text()}")
     except Exception as e:
-        return {"error": str(e)}
+        return ChatResult(False, str(e) or type(e).__name__)
 
-def test_account_portfolio():
-    """Test Account & Portfolio tools (3 tools)"""
-    print_test("ACCOUNT & PORTFOLIO", "Testing 3 tools")
+async def run_probes(session, probes):
+    """
+    Send a category's chat probes one at a time, then report them in order
+    
+    The server runs one chat turn at a time over a shared history, so concurrent
+    probes would only queue there (and time out while waiting) for no speedup.
     
-    # Test 1: get_account
-    result = send_chat_message("Show me my account details including cash, equity, and buying power")
-    passed = "error" not in result and result.get("response")
-    details = result.get("response", "")[:100] if passed else result.get("error", "Unknown error")
-    print_test("", "1. get_account", passed, details)
-    time.sleep(1)
+    Args:
+        session: Shared aiohttp session
+        probes: List of (test_name, message, note) - note replaces the response
+            preview in the details of a passing capability check
+    """
+    results = [await send_chat_message(session, message) for _, message, _ in probes]
     
-    # Test 2: get_all_positions
-    result = send_chat_message("List all my current positions")
-    passed = "error" not in result and result.get("response")
-    details = result.get("response", "")[:100] if passed else result.get("error", "Unknown error")
-    print_test("", "2. get_all_positions", passed, details)
-    time.sleep(1)
+    for (test_name, _, note), result in zip(probes, results):
+        details = (note or result.payload[:100]) if result.ok else result.payload
+        print_test("", test_name, result.ok, details)
+
+async def run_batched_probe(session, test_name, message, keywords):
+    """
+    Send one multi-intent chat message covering several tools
+    
+    Args:
+        session: Shared aiohttp session
+        test_name: Label covering every tool the message exercises
+        message: Combined prompt, answered by the server in a single AI conversation
+        keywords: Lowercase words the response must all contain to pass
+    """
+    result = await send_chat_message(session, message)
+    if not result.ok:
+        print_test("", test_name, False, result.payload)
+        return
     
-    # Test 3: close_position (will likely fail if no positions, but tests the tool)
-    result = send_chat_message("Do I have any positions to close?")
-    passed = "error" not in result and result.get("response")
-    details = "Tool available (may have no positions)" if passed else result.get("error", "Unknown error")
-    print_test("", "3. close_position (availability check)", passed, details)
-    time.sleep(1)
-
-def test_crypto():
+    response = result.payload.lower()
+    passed = all(keyword in response for keyword in keywords)
+    details = result.payload[:100] if passed else f"Response missing one of: {', '.join(keywords)}"
+    print_test("", test_name, passed, details)
+
+async def test_account_portfolio(session):
+    """Test Account & Portfolio tools (3 tools)"""
+    print_test("ACCOUNT & PORTFOLIO", "Testing 3 tools")
+    
+    # close_position will likely have nothing to close, but this tests the tool
+    await run_batched_probe(
+        session,
+        "1-3. get_account, get_all_positions, close_position (availability check)",
+        "Give me: (1) account details incl cash/equity/buying power, (2) all current positions, "
+        "(3) whether any positions could be closed",
+        ("cash", "position")
+    )
+    flush_output()
+
+async def test_crypto(session):
     """Test Crypto Trading tools (2 tools)"""
     print_test("CRYPTO TRADING", "Testing 2 tools")
     
-    # Test 4: get_crypto_latest_bar
-    result = send_chat_message("What's the current price of Bitcoin and Ethereum?")
-    passed = "error" not in result and result.get("response")
-    details = result.get("response", "")[:100] if passed else result.get("error", "Unknown error")
-    print_test("", "4. get_crypto_latest_bar", passed, details)
-    time.sleep(1)
-    
-    # Test 5: place_crypto_order (read-only check)
-    result = send_chat_message("If I wanted to buy $10 of Bitcoin, what would happen? Don't actually place the order, just explain.")
-    passed = "error" not in result and result.get("response")
-    details = "Tool available (no order placed)" if passed else result.get("error", "Unknown error")
-    print_test("", "5. place_crypto_order (capability check)", passed, details)
-    time.sleep(1)
-
-def test_stocks():
+    await run_probes(session, [
+        ("4. get_crypto_latest_bar", "What's the current price of Bitcoin and Ethereum?", None),
+        # place_crypto_order (read-only check)
+        ("5. place_crypto_order (capability check)",
+         "If I wanted to buy $10 of Bitcoin, what would happen? Don't actually place the order, just explain.",
+         "Tool available (no order placed)"),
+    ])
+    flush_output()
+
+async def test_stocks(session):
     """Test Stock Trading tools (4 tools)"""
     print_test("STOCK TRADING", "Testing 4 tools")
     
-    # Test 6: place_stock_order (capability check)
-    result = send_chat_message("Explain how to buy 10 shares of AAPL with a limit order. Don't place it.")
-    passed = "error" not in result and result.get("response")
-    details = "Tool available (no order placed)" if passed else result.get("error", "Unknown error")
-    print_test("", "6. place_stock_order (capability check)", passed, details)
-    time.sleep(1)
-    
-    # Test 7: get_stock_quote
-    result = send_chat_message("What's the current bid and ask price for AAPL?")
-    passed = "error" not in result and result.get("response")
-    details = result.get("response", "")[:100] if passed else result.get("error", "Unknown error")
-    print_test("", "7. get_stock_quote", passed, details)
-    time.sleep(1)
-    
-    # Test 8: get_stock_bars
-    result = send_chat_message("Show me the last 5 days of price data for MSFT")
-    passed = "error" not in result and result.get("response")
-    details = result.get("response", "")[:100] if passed else result.get("error", "Unknown error")
-    print_test("", "8. get_stock_bars", passed, details)
-    time.sleep(1)
-    
-    # Test 9: get_stock_snapshot
-    result = send_chat_message("Get a complete snapshot of TSLA including latest trade, quote, and daily performance")
-    passed = "error" not in result and result.get("response")
-    details = result.get("response", "")[:100] if passed else result.get("error", "Unknown error")
-    print_test("", "9. get_stock_snapshot", passed, details)
-    time.sleep(1)
-
-def test_options():
+    await run_probes(session, [
+        ("6. place_stock_order (capability check)",
+         "Explain how to buy 10 shares of AAPL with a limit order. Don't place it.",
+         "Tool available (no order placed)"),
+        ("7. get_stock_quote", "What's the current bid and ask price for AAPL?", None),
+        ("8. get_stock_bars", "Show me the last 5 days of price data for MSFT", None),
+        ("9. get_stock_snapshot",
+         "Get a complete snapshot of TSLA including latest trade, quote, and daily performance", None),
+    ])
+    flush_output()
+
+async def test_options(session):
     """Test Options Trading tools (2 tools)"""
     print_test("OPTIONS TRADING", "Testing 2 tools")
     
-    # Test 10: get_option_contracts
-    next_month = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
-    result = send_chat_message(f"Show me AAPL call options expiring around {next_month} with strike prices between $170 and $190")
-    passed = "error" not in result and result.get("response")
-    details = result.get("response", "")[:100] if passed else result.get("error", "Unknown error")
-    print_test("", "10. get_option_contracts", passed, details)
-    time.sleep(1)
-    
-    # Test 11: place_option_order (capability check)
-    result = send_chat_message("Explain how to buy an AAPL call option. Don't place the order.")
-    passed = "error" not in result and result.get("response")
-    details = "Tool available (no order placed)" if passed else result.get("error", "Unknown error")
-    print_test("", "11. place_option_order (capability check)", passed, details)
-    time.sleep(1)
-
-def test_order_management():
+    await run_probes(session, [
+        ("10. get_option_contracts",
+         f"Show me AAPL call options expiring around {NEXT_MONTH_ISO} with strike prices between $170 and $190", None),
+        ("11. place_option_order (capability check)",
+         "Explain how to buy an AAPL call option. Don't place the order.",
+         "Tool available (no order placed)"),
+    ])
+    flush_output()
+
+async def test_order_management(session):
     """Test Order Management tools (3 tools)"""
     print_test("ORDER MANAGEMENT", "Testing 3 tools")
     
-    # Test 12: get_orders
-    result = send_chat_message("Show me all my open orders")
-    passed = "error" not in result and result.get("response")
-    details = result.get("response", "")[:100] if passed else result.get("error", "Unknown error")
-    print_test("", "12. get_orders", passed, details)
-    time.sleep(1)
-    
-    # Test 13: cancel_order (capability check)
-    result = send_chat_message("How would I cancel a specific order by ID?")
-    passed = "error" not in result and result.get("response")
-    details = "Tool available" if passed else result.get("error", "Unknown error")
-    print_test("", "13. cancel_order (capability check)", passed, details)
-    time.sleep(1)
-    
-    # Test 14: cancel_all_orders (capability check)
-    result = send_chat_message("Do I have any orders I could cancel?")
-    passed = "error" not in result and result.get("response")
-    details = "Tool available (likely no orders)" if passed else result.get("error", "Unknown error")
-    print_test("", "14. cancel_all_orders (capability check)", passed, details)
-    time.sleep(1)
-
-def test_market_intelligence():
+    await run_batched_probe(
+        session,
+        "12-14. get_orders, cancel_order, cancel_all_orders (capability check)",
+        "Give me: (1) all my open orders, (2) how I would cancel a specific order by ID, "
+        "(3) whether I have any orders I could cancel",
+        ("order", "cancel")
+    )
+    flush_output()
+
+async def test_market_intelligence(session):
     """Test Market Intelligence tools (1 tool)"""
     print_test("MARKET INTELLIGENCE", "Testing 1 tool")
     
-    # Test 15: get_news
-    result = send_chat_message("Get the latest market news for AAPL and TSLA")
-    passed = "error" not in result and result.get("response")
-    details = result.get("response", "")[:100] if passed else result.get("error", "Unknown error")
-    print_test("", "15. get_news", passed, details)
-    time.sleep(1)
+    await run_probes(session, [
+        ("15. get_news", "Get the latest market news for AAPL and TSLA", None),
+    ])
+    flush_output()
+
+async def run_all():
+    """Run every test category over one pooled keep-alive session"""
+    connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await test_account_portfolio(session)
+        await test_crypto(session)
+        await test_stocks(session)
+        await test_options(session)
+        await test_order_management(session)
+        await test_market_intelligence(session)
 
 def check_server():
     """Check if server is running and initialized"""
     print_test("SETUP", "Checking server status")
     
     try:
-        response = requests.get(f"{SERVER_URL}/api/health", timeout=5)
+        response = SESSION.get(f"{SERVER_URL}/api/health", timeout=5)
         if response.status_code == 200:
-            health = response.json()
+            health = _json_loads(response.content)
             print_test("", "Server health check", True, f"Status: {health.get('status')}")
             
             if not health.get("initialized"):
@@ -205,7 +244,9 @@ def main():
     print("="*60)
     
     # Check server first
-    if not check_server():
+    server_ready = check_server()
+    flush_output()
+    if not server_ready:
         print("\n❌ Cannot proceed - server not available or not initialized")
         print("\nTo initialize:")
         print("1. Open the frontend (http://localhost:5173)")
@@ -220,12 +261,7 @@ def main():
     
     # Run all test categories
     try:
-        test_account_portfolio()
-        test_crypto()
-        test_stocks()
-        test_options()
-        test_order_management()
-        test_market_intelligence()
+        asyncio.run(run_all())
         
         print("\n" + "="*60)
         print("✅ ALL TESTS COMPLETE!")
@@ -236,8 +272,10 @@ def main():
         print("and returning valid responses from Alpaca.")
         
     except KeyboardInterrupt:
+        flush_output()
         print("\n\n⚠️  Tests interrupted by user")
     except Exception as e:
+        flush_output()
         print(f"\n\n❌ Test suite error: {e}")
 
 if __name__ == "__main__":
@@ -4,8 +4,11 @@ Direct API test - bypasses AI to test raw tool functionality
 Tests the tools that showed data limitations
 """
 
+import functools
+import io
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # Add current directory to path
@@ -23,112 +26,120 @@ from alpaca.data.requests import (
 )
 from alpaca.trading.requests import GetOptionContractsRequest
 
-def test_stock_snapshot():
+# One client per API, shared by every test (and thread) so they reuse connections
+API_KEY = os.getenv('ALPACA_API_KEY')
+API_SECRET = os.getenv('ALPACA_SECRET_KEY')
+STOCK_CLIENT = None
+TRADING_CLIENT = None
+if API_KEY:
+    STOCK_CLIENT = StockHistoricalDataClient(api_key=API_KEY, secret_key=API_SECRET)
+    TRADING_CLIENT = TradingClient(api_key=API_KEY, secret_key=API_SECRET, paper=True)
+
+# Option expiry used by the contract search, fixed for the whole run
+NEXT_MONTH_ISO = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
+
+@functools.lru_cache(maxsize=8)
+def get_option_contracts(symbol, expiration_date_lte, contract_type, limit):
+    """Option contract search, memoized so repeat runs in one process skip the request"""
+    request = GetOptionContractsRequest(
+        underlying_symbols=[symbol],
+        expiration_date_lte=expiration_date_lte,
+        type=contract_type,
+        limit=limit
+    )
+    return TRADING_CLIENT.get_option_contracts(request)
+
+def test_stock_snapshot(out=sys.stdout):
     """Test get_stock_snapshot directly"""
-    print("\n" + "="*60)
-    print("📊 Testing: get_stock_snapshot (TSLA)")
-    print("="*60)
+    print("\n" + "="*60, file=out)
+    print("📊 Testing: get_stock_snapshot (TSLA)", file=out)
+    print("="*60, file=out)
     
     try:
-        api_key = os.getenv('ALPACA_API_KEY')
-        api_secret = os.getenv('ALPACA_SECRET_KEY')
-        
-        client = StockHistoricalDataClient(api_key=api_key, secret_key=api_secret)
         request = StockSnapshotRequest(symbol_or_symbols=["TSLA"])
-        snapshots = client.get_stock_snapshot(request)
+        snapshots = STOCK_CLIENT.get_stock_snapshot(request)
         
         if "TSLA" in snapshots:
             snap = snapshots["TSLA"]
-            print("✅ Stock snapshot retrieved successfully")
+            print("✅ Stock snapshot retrieved successfully", file=out)
             
-            if snap.latest_trade:
-                print(f"   Latest Trade: ${snap.latest_trade.price:.2f} at {snap.latest_trade.timestamp}")
-            if snap.latest_quote:
-                print(f"   Latest Quote: Bid ${snap.latest_quote.bid_price:.2f}, Ask ${snap.latest_quote.ask_price:.2f}")
-            if snap.daily_bar:
-                print(f"   Daily Bar: Open ${snap.daily_bar.open:.2f}, Close ${snap.daily_bar.close:.2f}")
-            if snap.prev_daily_bar:
-                print(f"   Prev Daily: Close ${snap.prev_daily_bar.close:.2f}")
+            # Read each model field once
+            trade, quote = snap.latest_trade, snap.latest_quote
+            daily_bar, prev_daily_bar = snap.daily_bar, snap.prev_daily_bar
+            if trade:
+                print(f"   Latest Trade: ${trade.price:.2f} at {trade.timestamp}", file=out)
+            if quote:
+                print(f"   Latest Quote: Bid ${quote.bid_price:.2f}, Ask ${quote.ask_price:.2f}", file=out)
+            if daily_bar:
+                print(f"   Daily Bar: Open ${daily_bar.open:.2f}, Close ${daily_bar.close:.2f}", file=out)
+            if prev_daily_bar:
+                print(f"   Prev Daily: Close ${prev_daily_bar.close:.2f}", file=out)
             
             return True
         else:
-            print("❌ No data returned for TSLA")
+            print("❌ No data returned for TSLA", file=out)
             return False
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"❌ Error: {e}", file=out)
         return False
 
-def test_option_contracts():
+def test_option_contracts(out=sys.stdout):
     """Test get_option_contracts directly"""
-    print("\n" + "="*60)
-    print("🎯 Testing: get_option_contracts (SPY)")
-    print("="*60)
+    print("\n" + "="*60, file=out)
+    print("🎯 Testing: get_option_contracts (SPY)", file=out)
+    print("="*60, file=out)
     
     try:
-        api_key = os.getenv('ALPACA_API_KEY')
-        api_secret = os.getenv('ALPACA_SECRET_KEY')
-        
-        client = TradingClient(api_key=api_key, secret_key=api_secret, paper=True)
-        
         # Search for SPY options (highly liquid)
-        next_month = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
-        request = GetOptionContractsRequest(
-            underlying_symbols=["SPY"],
-            expiration_date_lte=next_month,
-            type="call",
-            limit=5
-        )
-        
-        contracts = client.get_option_contracts(request)
+        option_contracts = get_option_contracts("SPY", NEXT_MONTH_ISO, "call", 5).option_contracts
         
-        if contracts.option_contracts and len(contracts.option_contracts) > 0:
-            print(f"✅ Found {len(contracts.option_contracts)} option contracts")
-            for i, contract in enumerate(contracts.option_contracts[:3], 1):
-                print(f"   {i}. {contract.name}")
-                print(f"      Symbol: {contract.symbol}")
-                print(f"      Strike: ${contract.strike_price}")
-                print(f"      Expiry: {contract.expiration_date}")
+        if option_contracts:
+            print(f"✅ Found {len(option_contracts)} option contracts", file=out)
+            for i, c in enumerate(option_contracts[:3], 1):
+                print(f"   {i}. {c.name}\n      Symbol: {c.symbol}\n"
+                      f"      Strike: ${c.strike_price}\n      Expiry: {c.expiration_date}", file=out)
             return True
         else:
-            print("⚠️  No option contracts found (may be API limitation in paper trading)")
-            print("   Note: Options might only be available in live trading accounts")
+            print("⚠️  No option contracts found (may be API limitation in paper trading)", file=out)
+            print("   Note: Options might only be available in live trading accounts", file=out)
             return False
     except Exception as e:
-        print(f"❌ Error: {e}")
-        print("   Note: Options API may require special account permissions")
+        print(f"❌ Error: {e}", file=out)
+        print("   Note: Options API may require special account permissions", file=out)
         return False
 
-def test_news():
+def test_news(out=sys.stdout):
     """Test get_news directly"""
-    print("\n" + "="*60)
-    print("📰 Testing: get_news (AAPL)")
-    print("="*60)
+    print("\n" + "="*60, file=out)
+    print("📰 Testing: get_news (AAPL)", file=out)
+    print("="*60, file=out)
     
     try:
-        api_key = os.getenv('ALPACA_API_KEY')
-        api_secret = os.getenv('ALPACA_SECRET_KEY')
-        
-        client = StockHistoricalDataClient(api_key=api_key, secret_key=api_secret)
         request = NewsRequest(symbols=["AAPL"], limit=5)
         
-        news_articles = client.get_news(request)
+        news_articles = STOCK_CLIENT.get_news(request)
         
-        if news_articles and len(news_articles) > 0:
-            print(f"✅ Found {len(news_articles)} news articles")
+        if news_articles:
+            print(f"✅ Found {len(news_articles)} news articles", file=out)
             for i, article in enumerate(news_articles[:3], 1):
-                print(f"   {i}. {article.headline}")
-                print(f"      Author: {article.author}")
-                print(f"      Time: {article.created_at}")
+                print(f"   {i}. {article.headline}\n      Author: {article.author}\n"
+                      f"      Time: {article.created_at}", file=out)
             return True
         else:
-            print("⚠️  No news articles found")
-            print("   Note: News might be delayed or require subscription")
+            print("⚠️  No news articles found", file=out)
+            print("   Note: News might be delayed or require subscription", file=out)
             return False
     except Exception as e:
-        print(f"❌ Error: {e}")
-        print("   Note: News API may require subscription or have rate limits")
+        print(f"❌ Error: {e}", file=out)
+        print("   Note: News API may require subscription or have rate limits", file=out)
         return False
 
+def run_buffered(test):
+    """Run one test with its output captured, so parallel tests print in order"""
+    out = io.StringIO()
+    passed = test(out)
+    return passed, out.getvalue()
+
 def main():
     print("\n" + "="*60)
     print("🔧 DIRECT API TEST")
@@ -138,16 +149,26 @@ def main():
     print("="*60)
     
     # Check environment
-    if not os.getenv('ALPACA_API_KEY'):
+    if not API_KEY:
         print("\n❌ ALPACA_API_KEY not found in environment")
         print("   Please check keys.env file")
         return
     
-    results = {
-        "stock_snapshot": test_stock_snapshot(),
-        "option_contracts": test_option_contracts(),
-        "news": test_news()
-    }
+    tests = [
+        ("stock_snapshot", test_stock_snapshot),
+        ("option_contracts", test_option_contracts),
+        ("news", test_news)
+    ]
+    
+    # Independent API round-trips - overlap them, then print each test's output in order
+    with ThreadPoolExecutor(max_workers=len(tests)) as pool:
+        futures = [(name, pool.submit(run_buffered, test)) for name, test in tests]
+    
+    results = {}
+    for name, future in futures:
+        passed, output = future.result()
+        sys.stdout.write(output)
+        results[name] = passed
     
     print("\n" + "="*60)
     print("📊 SUMMARY")
@@ -4,19 +4,43 @@ Proper MCP Client for Alpaca Trading
 Uses the official mcp SDK to connect to the Alpaca MCP server
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import os
+import sys
 import json
 import logging
 import asyncio
+import itertools
+import concurrent.futures
+import contextvars
 import threading
 import time
+from collections import OrderedDict, deque
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Any, Optional
 from anthropic import Anthropic
-from mcp import ClientSession, StdioServerParameters
+from mcp import ClientSession, StdioServerParameters, types as mcp_types
 from mcp.client.stdio import stdio_client
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (and unavailable on Windows) - falls back to the stdlib loop
+    uvloop = None
+
+try:
+    import orjson
+    
+    def _j(obj):
+        """Compact JSON text for prompts and log lines"""
+        return orjson.dumps(obj).decode()
+except ImportError:  # orjson is optional - same compact output from stdlib json, just slower
+    def _j(obj):
+        """Compact JSON text for prompts and log lines"""
+        return json.dumps(obj, separators=(',', ':'))
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,93 +51,207 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)
 
-# Global state
-mcp_session = None
-mcp_read = None
-mcp_write = None
-anthropic_client = None
-alpaca_api_key = None
-alpaca_secret_key = None
-paper_mode = True
+@dataclass(slots=True)
+class AppState:
+    """Clients and credentials from the last /api/initialize, replaced as a whole"""
+    mcp_session: Any = None
+    anthropic_client: Optional[Anthropic] = None
+    alpaca_api_key: Optional[str] = None
+    alpaca_secret_key: Optional[str] = None
+    paper_mode: bool = True
+
+# Readers take one snapshot (state = app.config["state"]); initialize() swaps in a new object
+app.config["state"] = AppState()
+_initialize_lock = threading.Lock()
 
 # Auto-trading state
 autotrading_active = False
 autotrading_thread = None
 autotrading_config = None
-autotrading_logs = []
+_autotrade_stop = threading.Event()  # set by stop_autotrading; wakes the loop out of its interval wait
+_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="autotrade")
+autotrading_logs = deque(maxlen=100)  # oldest entries fall off automatically
 conversation_history = []
+# Held for a whole chat turn: concurrent turns would interleave their tool_use/tool_result messages
+_history_lock = threading.Lock()
 
 def add_autotrading_log(message, log_type="info"):
     """Add a log entry for auto-trading"""
-    global autotrading_logs
+    # Epoch seconds are cheap to take; the ISO string is built only when /api/autotrading/logs serves it
     log_entry = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": time.time(),
         "message": message,
         "type": log_type
     }
     autotrading_logs.append(log_entry)
-    if len(autotrading_logs) > 100:
-        autotrading_logs = autotrading_logs[-100:]
-    logger.info(f"Auto-trading: {message}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Auto-trading: %s", message)
 
 # Background event loop for MCP
 mcp_loop = None
 mcp_thread = None
-mcp_connection_ready = threading.Event()
 
 def start_mcp_loop():
     """Start the event loop in a background thread"""
     global mcp_loop
-    mcp_loop = asyncio.new_event_loop()
+    mcp_loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    if sys.version_info >= (3, 12):
+        # MCP calls that finish without suspending complete inside create_task
+        mcp_loop.set_task_factory(asyncio.eager_task_factory)
     asyncio.set_event_loop(mcp_loop)
     mcp_loop.run_forever()
 
-async def connect_to_mcp_server_async():
-    """Connect to the official Alpaca MCP server using stdio transport"""
-    global mcp_session, mcp_read, mcp_write
+def alpaca_server_params(api_key, secret_key, paper):
+    """Launch parameters for the official Alpaca MCP server"""
+    return StdioServerParameters(
+        command="alpaca-mcp-server",
+        args=["serve"],
+        env={
+            "ALPACA_API_KEY": api_key,
+            "ALPACA_SECRET_KEY": secret_key,
+            "ALPACA_PAPER_TRADE": "True" if paper else "False"
+        }
+    )
+
+class MCPHost:
+    """
+    Owns the MCP server subprocesses and their ClientSessions, keyed by server name
     
-    try:
-        # Configure server parameters
-        server_params = StdioServerParameters(
-            command="alpaca-mcp-server",
-            args=["serve"],
-            env={
-                "ALPACA_API_KEY": alpaca_api_key,
-                "ALPACA_SECRET_KEY": alpaca_secret_key,
-                "ALPACA_PAPER_TRADE": "True" if paper_mode else "False"
-            }
-        )
+    Each server's stdio transport and session are entered on an AsyncExitStack by
+    its own owner task, because their anyio cancel scopes must be exited by the
+    task that entered them. Servers start in parallel, and tool_registry maps each
+    tool name to the server that provides it so call_tool routes in one lookup.
+    connect_all() with an unchanged configuration reuses the running servers;
+    a changed one closes them all and starts afresh.
+    """
+    
+    def __init__(self):
+        self.sessions = {}       # server name -> ClientSession
+        self.tool_registry = {}  # tool name -> (server name, Tool)
+        self._config_key = None
+        self._owners = {}        # server name -> owner task
+        self._closing = asyncio.Event()
+    
+    async def connect_all(self, servers, config_key):
+        """
+        Start (or keep) every server in parallel
         
-        logger.info(f"Starting Alpaca MCP server with paper_mode={paper_mode}")
+        Args:
+            servers: Server name -> StdioServerParameters
+            config_key: Hashable summary of the configuration (e.g. the credentials)
         
-        # Connect using stdio transport with async context manager
-        async with stdio_client(server_params) as (read, write):
-            mcp_read = read
-            mcp_write = write
-            
-            logger.info("Stdio connection established, creating session...")
-            
-            # Create session
-            mcp_session = ClientSession(read, write)
-            
-            logger.info("Session created, initializing...")
-            
-            # Initialize the session
-            await mcp_session.initialize()
-            
-            logger.info("Successfully connected to Alpaca MCP server")
-            mcp_connection_ready.set()
-            
-            # Keep the connection alive indefinitely
-            await asyncio.Event().wait()
-    except Exception as e:
-        logger.error(f"Error in connect_to_mcp_server_async: {e}")
-        logger.exception("Full traceback:")
-        mcp_connection_ready.set()  # Set anyway to unblock, but connection failed
-        raise
+        Returns:
+            Server name -> ClientSession
+        """
+        if self.sessions and set(self.sessions) == set(servers) and config_key == self._config_key:
+            logger.info("MCP configuration unchanged, reusing the running servers")
+            return self.sessions
+        
+        await self.close()
+        self._closing = asyncio.Event()
+        try:
+            await asyncio.gather(*(self.connect(name, params) for name, params in servers.items()))
+        except Exception:
+            await self.close()
+            raise
+        self._config_key = config_key
+        try:
+            await self.refresh_tools()
+        except Exception as e:
+            logger.warning(f"Could not list MCP tools yet, will retry on first use: {e}")
+        return self.sessions
+    
+    async def connect(self, name, server_params):
+        """Start one server, add its session to self.sessions and return it"""
+        logger.info(f"Starting MCP server '{name}' ({server_params.command})")
+        ready = asyncio.get_running_loop().create_future()
+        self._owners[name] = asyncio.create_task(self._own_connection(name, server_params, ready))
+        session = await ready
+        self.sessions[name] = session
+        logger.info(f"Successfully connected to MCP server '{name}'")
+        return session
+    
+    async def refresh_tools(self):
+        """Rebuild tool_registry from every server's tool list"""
+        names = list(self.sessions)
+        results = await asyncio.gather(*(self.sessions[name].list_tools() for name in names))
+        registry = {}
+        for name, result in zip(names, results):
+            for tool in result.tools:
+                if tool.name in registry:
+                    logger.warning(f"Tool '{tool.name}' from '{name}' shadows the one from '{registry[tool.name][0]}'")
+                registry[tool.name] = (name, tool)
+        self.tool_registry = registry
+    
+    async def get_all_tools(self):
+        """Every tool across the connected servers"""
+        if not self.tool_registry:
+            await self.refresh_tools()
+        return [tool for _, tool in self.tool_registry.values()]
+    
+    async def call_tool(self, tool_name, arguments):
+        """Call a tool on whichever server provides it"""
+        if tool_name not in self.tool_registry:
+            await self.refresh_tools()
+        try:
+            server_name = self.tool_registry[tool_name][0]
+        except KeyError:
+            raise ValueError(f"Unknown MCP tool: {tool_name}") from None
+        return await self.sessions[server_name].call_tool(tool_name, arguments)
+    
+    async def close(self):
+        """Close every session and stop the MCP server subprocesses"""
+        owners = list(self._owners.values())
+        self._owners = {}
+        self.sessions = {}
+        self.tool_registry = {}
+        self._config_key = None
+        if owners:
+            self._closing.set()
+            await asyncio.gather(*owners, return_exceptions=True)
+    
+    async def _on_message(self, message):
+        """Drop the tool registry and cached tool list when a server says its tools changed"""
+        if (isinstance(message, mcp_types.ServerNotification)
+                and isinstance(message.root, mcp_types.ToolListChangedNotification)):
+            logger.info("MCP tool list changed, refreshing on next use")
+            self.tool_registry = {}
+            clear_tools_cache()
+    
+    async def _own_connection(self, name, server_params, ready):
+        """Enter one server's transport and session, then hold them open until close()"""
+        closing = self._closing
+        try:
+            async with AsyncExitStack() as stack:
+                read, write = await stack.enter_async_context(stdio_client(server_params))
+                logger.info(f"Stdio connection to '{name}' established, initializing session...")
+                session = await stack.enter_async_context(
+                    ClientSession(read, write, message_handler=self._on_message)
+                )
+                await session.initialize()
+                if ready.done():
+                    return  # connect() gave up waiting - close straight away
+                ready.set_result(session)
+                await closing.wait()
+        except Exception as e:
+            logger.error(f"MCP connection error ({name}): {e}")
+            logger.exception("Full traceback:")
+            if not ready.done():
+                ready.set_exception(e)
+        finally:
+            if self._owners.get(name) is asyncio.current_task():
+                # Server went away on its own - don't hand out a dead session or route to it
+                del self._owners[name]
+                self.sessions.pop(name, None)
+                self.tool_registry = {
+                    tool_name: entry for tool_name, entry in self.tool_registry.items() if entry[0] != name
+                }
+                self._config_key = None
 
-def connect_to_mcp_server():
-    """Initialize MCP connection in background thread"""
+mcp_host = MCPHost()
+
+def connect_to_mcp_server(api_key, secret_key, paper):
+    """Initialize MCP connection in background thread and return the Alpaca session"""
     global mcp_thread, mcp_loop
     
     # Start event loop in background thread if not already running
@@ -122,45 +260,201 @@ def connect_to_mcp_server():
         mcp_thread.start()
         time.sleep(0.5)  # Give thread time to start
     
-    # Schedule the connection in the background loop
-    future = asyncio.run_coroutine_threadsafe(connect_to_mcp_server_async(), mcp_loop)
-    
-    # Wait for connection to be ready (with timeout)
-    if not mcp_connection_ready.wait(timeout=30):
+    # Connect (or keep the existing connection) on the background loop
+    future = _submit_to_mcp_loop(mcp_host.connect_all(
+        {"alpaca": alpaca_server_params(api_key, secret_key, paper)},
+        config_key=(api_key, secret_key, paper)
+    ))
+    try:
+        sessions = future.result(timeout=30)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
         raise Exception("MCP connection timeout")
     
     logger.info("MCP connection established and ready")
-    return True
+    return sessions["alpaca"]
+
+def _on_mcp_loop():
+    """True when called from code already running on mcp_loop"""
+    try:
+        return asyncio.get_running_loop() is mcp_loop
+    except RuntimeError:
+        return False
+
+# Rule for the MCP async layer: code already running on mcp_loop (handlers,
+# notification callbacks, helpers awaited by call_mcp_tool_async) schedules
+# further work with create_task and never goes back through the thread-safe
+# queue. Only Flask/auto-trading threads cross over, via run_on_mcp_loop or
+# _submit_to_mcp_loop.
+def _submit_to_mcp_loop(coro):
+    """
+    Schedule a coroutine on mcp_loop from whichever thread we're on
+    
+    Returns:
+        An asyncio.Task when already on mcp_loop, otherwise a concurrent.futures.Future
+    """
+    if _on_mcp_loop():
+        return asyncio.create_task(coro)
+    return asyncio.run_coroutine_threadsafe(coro, mcp_loop)
+
+# MCP calls never read the caller's context variables (Flask's request/app
+# context included), so the bridge hops onto the loop in this empty context
+# rather than snapshotting the calling thread's. Only the start callback runs
+# in it; the task takes its own copy, so nothing a task sets leaks back here.
+_BRIDGE_CONTEXT = contextvars.Context()
+
+def run_on_mcp_loop(coro, timeout=30):
+    """
+    Run a coroutine on the MCP loop from a sync thread and wait for its result
+    
+    A lighter bridge than asyncio.run_coroutine_threadsafe: a single
+    call_soon_threadsafe hop that starts the task, and a done-callback that
+    copies its outcome into a concurrent Future (no two-way future chaining,
+    no copy of the caller's contextvars).
+    """
+    if _on_mcp_loop():
+        coro.close()
+        raise RuntimeError("run_on_mcp_loop would block mcp_loop; await the coroutine or use _submit_to_mcp_loop")
+    
+    future = concurrent.futures.Future()
+    
+    def copy_outcome(task):
+        if task.cancelled():
+            future.set_exception(concurrent.futures.CancelledError())
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+    
+    def start():
+        if not future.set_running_or_notify_cancel():
+            coro.close()  # Caller timed out before the loop got to it
+            return
+        mcp_loop.create_task(coro).add_done_callback(copy_outcome)
+    
+    mcp_loop.call_soon_threadsafe(start, context=_BRIDGE_CONTEXT)
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
 
 async def call_mcp_tool_async(tool_name: str, arguments: dict):
-    """Call a tool on the MCP server (async)"""
-    if not mcp_session:
+    """Call a tool on the MCP server that provides it (async)"""
+    if not mcp_host.sessions:
         raise Exception("MCP session not initialized")
     
-    result = await mcp_session.call_tool(tool_name, arguments)
+    result = await mcp_host.call_tool(tool_name, arguments)
     return result
 
 def call_mcp_tool(tool_name: str, arguments: dict):
     """Call a tool on the MCP server (sync wrapper)"""
     if not mcp_loop:
         raise Exception("MCP loop not started")
-    future = asyncio.run_coroutine_threadsafe(call_mcp_tool_async(tool_name, arguments), mcp_loop)
-    return future.result(timeout=30)
+    return run_on_mcp_loop(call_mcp_tool_async(tool_name, arguments))
+
+# Read-only MCP tools whose results may be reused briefly (seconds); anything else bypasses the cache
+_CACHEABLE_TOOLS = {"get_account": 2.0, "get_all_positions": 2.0}
+_RESULT_CACHE_MAX = 256
+
+# (tool_name, canonical JSON arguments) -> (monotonic expiry, result), oldest first
+_result_cache = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+def call_mcp_tool_cached(tool_name: str, arguments: dict, ttl: float = None):
+    """
+    call_mcp_tool with a short-lived cache for idempotent reads
+    
+    Args:
+        tool_name: MCP tool to call
+        arguments: Tool arguments
+        ttl: Seconds to reuse the result (defaults to the tool's _CACHEABLE_TOOLS entry)
+    
+    Returns:
+        The MCP call result, possibly from the cache
+    """
+    if ttl is None:
+        ttl = _CACHEABLE_TOOLS.get(tool_name, 0)
+    
+    if not ttl:
+        # Anything that isn't a cached read may change account state - drop stale reads
+        with _result_cache_lock:
+            _result_cache.clear()
+        return call_mcp_tool(tool_name, arguments)
+    
+    key = (tool_name, json.dumps(arguments, sort_keys=True))
+    now = time.monotonic()
+    with _result_cache_lock:
+        cached = _result_cache.get(key)
+        if cached is not None and now < cached[0]:
+            _result_cache.move_to_end(key)
+            return cached[1]
+    
+    result = call_mcp_tool(tool_name, arguments)
+    
+    with _result_cache_lock:
+        _result_cache[key] = (now + ttl, result)
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > _RESULT_CACHE_MAX:
+            _result_cache.popitem(last=False)
+    return result
+
+def mcp_result_text(result):
+    """First content item of an MCP tool result as text ("" when the result is empty)"""
+    if not result.content:
+        return ""
+    text = result.content[0].text
+    return text if isinstance(text, str) else json.dumps(text)
+
+def parse_mcp_result(result, default=None):
+    """First content item of an MCP tool result, decoded once if it is JSON text"""
+    if not result.content:
+        return default
+    text = result.content[0].text
+    return json.loads(text) if isinstance(text, str) else text
 
 async def list_mcp_tools_async():
-    """List available tools from the MCP server (async)"""
-    if not mcp_session:
+    """List available tools across the connected MCP servers (async)"""
+    if not mcp_host.sessions:
         raise Exception("MCP session not initialized")
     
-    tools = await mcp_session.list_tools()
+    tools = await mcp_host.get_all_tools()
     return tools
 
 def list_mcp_tools():
     """List available tools from the MCP server (sync wrapper)"""
     if not mcp_loop:
         raise Exception("MCP loop not started")
-    future = asyncio.run_coroutine_threadsafe(list_mcp_tools_async(), mcp_loop)
-    return future.result(timeout=30)
+    return run_on_mcp_loop(list_mcp_tools_async())
+
+# Arguments shared by every Claude request
+_MESSAGES_CREATE_DEFAULTS = {"model": "claude-3-5-sonnet-20241022", "max_tokens": 4096}
+
+# Claude-format tool list from the MCP server; schemas don't change within a session
+_tools_cache = {"tools": None, "claude_tools": None, "expires": 0.0}
+
+def get_claude_tools(ttl=300):
+    """MCP tools converted to Claude's format, cached for ttl seconds (cleared on initialize)"""
+    if _tools_cache["claude_tools"] is not None and time.monotonic() < _tools_cache["expires"]:
+        return _tools_cache["claude_tools"]
+    
+    tools = list_mcp_tools()
+    # Tuple so every messages.create call shares one immutable payload
+    claude_tools = tuple(
+        {
+            "name": tool.name,
+            "description": tool.description,
+            "input_schema": tool.inputSchema
+        }
+        for tool in tools
+    )
+    
+    _tools_cache.update(tools=tools, claude_tools=claude_tools, expires=time.monotonic() + ttl)
+    return claude_tools
+
+def clear_tools_cache():
+    """Drop the cached tool list so the next lookup asks the MCP server again"""
+    _tools_cache.update(tools=None, claude_tools=None, expires=0.0)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -168,14 +462,12 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "implementation": "Official Alpaca MCP Server via mcp SDK",
-        "initialized": mcp_session is not None
+        "initialized": app.config["state"].mcp_session is not None
     })
 
 @app.route('/api/initialize', methods=['POST'])
 def initialize():
     """Initialize with API keys and connect to MCP server"""
-    global alpaca_api_key, alpaca_secret_key, anthropic_client, paper_mode, conversation_history, mcp_connection_ready
-    
     data = request.json
     alpaca_api_key = data.get('alpaca_key')
     alpaca_secret_key = data.get('alpaca_secret')
@@ -183,17 +475,34 @@ def initialize():
     paper_mode = data.get('paper_mode', True)
     
     try:
-        # Initialize Claude
-        anthropic_client = Anthropic(api_key=claude_key)
-        
-        # Reset connection ready flag
-        mcp_connection_ready.clear()
-        
-        # Connect to MCP server (runs in background thread)
-        connect_to_mcp_server()
-        
-        # Clear conversation history
-        conversation_history = []
+        with _initialize_lock:
+            # Initialize Claude
+            anthropic_client = Anthropic(api_key=claude_key)
+            
+            # Connect to MCP server (runs in background thread)
+            mcp_session = connect_to_mcp_server(alpaca_api_key, alpaca_secret_key, paper_mode)
+            
+            # Publish the new clients in a single assignment
+            app.config["state"] = AppState(
+                mcp_session=mcp_session,
+                anthropic_client=anthropic_client,
+                alpaca_api_key=alpaca_api_key,
+                alpaca_secret_key=alpaca_secret_key,
+                paper_mode=paper_mode
+            )
+            
+            # Clear conversation history and the previous server's tool list
+            with _history_lock:
+                conversation_history.clear()
+            clear_tools_cache()
+            with _result_cache_lock:
+                _result_cache.clear()
+            
+            # Prime the tool list now (connect_all already fetched it) so chat() makes no MCP call up front
+            try:
+                get_claude_tools()
+            except Exception as e:
+                logger.warning(f"Could not prime MCP tool list, will fetch on first chat: {e}")
         
         logger.info(f"Initialized in {'PAPER' if paper_mode else 'LIVE'} mode with official MCP server")
         
@@ -206,15 +515,33 @@ def initialize():
         logger.exception("Full traceback:")
         return jsonify({"error": str(e)}), 500
 
+def mcp_json_response(result, default):
+    """
+    Serve an MCP tool result's JSON text as the response body without re-encoding it
+    
+    Args:
+        result: MCP tool result
+        default: Value to send when the result is empty
+    
+    Returns:
+        The text as application/json when it is a JSON object or array, otherwise jsonify() of it
+    """
+    text = mcp_result_text(result)
+    if not text:
+        return jsonify(default)
+    if text.lstrip()[:1] in ("{", "["):
+        return Response(text, mimetype="application/json")
+    return jsonify(text)  # Plain-text message from the server
+
 @app.route('/api/account', methods=['GET'])
 def get_account():
     """Get account information via MCP"""
-    if not mcp_session:
+    if not app.config["state"].mcp_session:
         return jsonify({"error": "Not initialized"}), 400
     
     try:
-        result = call_mcp_tool("get_account", {})
-        return jsonify(result.content[0].text if result.content else {})
+        result = call_mcp_tool_cached("get_account", {})
+        return mcp_json_response(result, {})
     except Exception as e:
         logger.error(f"Error getting account: {e}")
         return jsonify({"error": str(e)}), 500
@@ -222,17 +549,12 @@ def get_account():
 @app.route('/api/positions', methods=['GET'])
 def get_positions():
     """Get current positions via MCP"""
-    if not mcp_session:
+    if not app.config["state"].mcp_session:
         return jsonify({"error": "Not initialized"}), 400
     
     try:
-        result = call_mcp_tool("get_all_positions", {})
-        
-        # Parse the result
-        if result.content:
-            content = result.content[0].text
-            return jsonify(json.loads(content))
-        return jsonify([])
+        result = call_mcp_tool_cached("get_all_positions", {})
+        return mcp_json_response(result, [])
     except Exception as e:
         logger.error(f"Error getting positions: {e}")
         return jsonify({"error": str(e)}), 500
@@ -240,121 +562,200 @@ def get_positions():
 @app.route('/api/tools', methods=['GET'])
 def get_tools():
     """List available MCP tools"""
-    if not mcp_session:
+    if not app.config["state"].mcp_session:
         return jsonify({"error": "Not initialized"}), 400
     
     try:
-        tools = list_mcp_tools()
-        
-        # Convert tools to Claude-compatible format
-        tool_list = []
-        for tool in tools.tools:
-            tool_list.append({
-                "name": tool.name,
-                "description": tool.description,
-                "input_schema": tool.inputSchema
-            })
-        
-        return jsonify({"tools": tool_list})
+        return jsonify({"tools": get_claude_tools()})
     except Exception as e:
         logger.error(f"Error listing tools: {e}")
         return jsonify({"error": str(e)}), 500
 
+# Chat history limits: messages kept, user turns whose tool results stay verbatim,
+# and the size above which a JSON tool result is re-encoded compactly
+MAX_HISTORY_MESSAGES = 20
+KEEP_TOOL_RESULT_TURNS = 2
+COMPACT_TOOL_RESULT_BYTES = 8192
+
+def _is_user_turn(message):
+    """True for a message the user typed (tool results also travel as user messages)"""
+    return message["role"] == "user" and isinstance(message["content"], str)
+
+def prune_conversation_history():
+    """Cap the history at MAX_HISTORY_MESSAGES and elide tool results from older turns"""
+    if len(conversation_history) > MAX_HISTORY_MESSAGES:
+        # Cut at a user turn so no tool_result is left without its tool_use
+        first = len(conversation_history) - MAX_HISTORY_MESSAGES
+        start = next(
+            (i for i in range(first, len(conversation_history)) if _is_user_turn(conversation_history[i])),
+            len(conversation_history) - 1
+        )
+        del conversation_history[:start]
+    
+    user_turns = [i for i, message in enumerate(conversation_history) if _is_user_turn(message)]
+    if len(user_turns) <= KEEP_TOOL_RESULT_TURNS:
+        return
+    for message in conversation_history[:user_turns[-KEEP_TOOL_RESULT_TURNS]]:
+        if message["role"] != "user" or isinstance(message["content"], str):
+            continue
+        for block in message["content"]:
+            if block.get("type") == "tool_result" and not block["content"].startswith("<elided"):
+                block["content"] = f"<elided: {len(block['content'])} bytes>"
+
+def compact_tool_result(text):
+    """Re-encode a large JSON tool result without whitespace (other text is returned as is)"""
+    if len(text) <= COMPACT_TOOL_RESULT_BYTES:
+        return text
+    try:
+        return json.dumps(json.loads(text), separators=(',', ':'))
+    except ValueError:
+        return text
+
+def _claude_turn(anthropic_client, claude_tools, stream):
+    """
+    One Claude request over conversation_history
+    
+    A generator: yields text deltas as they arrive when stream is true (nothing
+    otherwise) and returns the complete Message either way.
+    """
+    if not stream:
+        return anthropic_client.messages.create(
+            **_MESSAGES_CREATE_DEFAULTS,
+            tools=claude_tools,
+            messages=conversation_history
+        )
+    
+    with anthropic_client.messages.stream(
+        **_MESSAGES_CREATE_DEFAULTS,
+        tools=claude_tools,
+        messages=conversation_history
+    ) as message_stream:
+        yield from message_stream.text_stream
+        return message_stream.get_final_message()
+
+def _run_chat(anthropic_client, claude_tools, stream):
+    """
+    Answer the user message at the end of conversation_history, running MCP tools as Claude asks
+    
+    A generator like _claude_turn: yields text deltas when streaming and returns
+    the final response text, which is also appended to the history.
+    """
+    # Call Claude with MCP tools
+    response = yield from _claude_turn(anthropic_client, claude_tools, stream)
+    
+    # Process tool calls
+    while response.stop_reason == "tool_use":
+        assistant_content = []
+        tool_results = []
+        
+        for block in response.content:
+            if hasattr(block, 'text'):
+                assistant_content.append({"type": "text", "text": block.text})
+            elif block.type == "tool_use":
+                assistant_content.append({
+                    "type": "tool_use",
+                    "id": block.id,
+                    "name": block.name,
+                    "input": block.input
+                })
+                
+                # Execute tool via MCP (now synchronous)
+                result = call_mcp_tool_cached(block.name, block.input)
+                
+                tool_results.append({
+                    "type": "tool_result",
+                    "tool_use_id": block.id,
+                    "content": compact_tool_result(mcp_result_text(result))
+                })
+        
+        conversation_history.append({"role": "assistant", "content": assistant_content})
+        conversation_history.append({"role": "user", "content": tool_results})
+        
+        # Get next response
+        response = yield from _claude_turn(anthropic_client, claude_tools, stream)
+    
+    # Final text response
+    response_text = ""
+    for block in response.content:
+        if hasattr(block, 'text'):
+            response_text = block.text
+    
+    conversation_history.append({
+        "role": "assistant",
+        "content": [{"type": "text", "text": response_text}]
+    })
+    
+    return response_text
+
+def _sse(payload, event=None):
+    """Format one server-sent event"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {_j(payload)}\n\n"
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
-    """Chat endpoint for trading commands using MCP tools"""
-    global conversation_history
+    """
+    Chat endpoint for trading commands using MCP tools
     
+    Replies with {"response": ...} by default. With "stream": true in the body it
+    replies with server-sent events instead: {"delta": ...} for each text chunk as
+    Claude generates it, then {"response": ..., "done": true} (or an "error" event).
+    """
     data = request.json
     user_message = data.get('message')
     
     if not user_message:
         return jsonify({"error": "No message provided"}), 400
     
-    if not anthropic_client or not mcp_session:
+    state = app.config["state"]
+    anthropic_client = state.anthropic_client
+    if not anthropic_client or not state.mcp_session:
         return jsonify({"error": "Not initialized"}), 400
     
     try:
-        # Get available MCP tools
-        mcp_tools = list_mcp_tools()
+        # Get available MCP tools (Claude format, cached)
+        claude_tools = get_claude_tools()
         
-        # Convert to Claude format
-        claude_tools = []
-        for tool in mcp_tools.tools:
-            claude_tools.append({
-                "name": tool.name,
-                "description": tool.description,
-                "input_schema": tool.inputSchema
-            })
-        
-        # Add user message to history
-        conversation_history.append({
-            "role": "user",
-            "content": user_message
-        })
-        
-        # Call Claude with MCP tools
-        response = anthropic_client.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=4096,
-            tools=claude_tools,
-            messages=conversation_history
-        )
-        
-        # Process tool calls
-        while response.stop_reason == "tool_use":
-            assistant_content = []
-            tool_results = []
-            
-            for block in response.content:
-                if hasattr(block, 'text'):
-                    assistant_content.append({"type": "text", "text": block.text})
-                elif block.type == "tool_use":
-                    assistant_content.append({
-                        "type": "tool_use",
-                        "id": block.id,
-                        "name": block.name,
-                        "input": block.input
+        if data.get('stream'):
+            def generate():
+                # Runs after chat() has returned, so the whole turn happens here under the lock
+                with _history_lock:
+                    # Add user message to history
+                    conversation_history.append({
+                        "role": "user",
+                        "content": user_message
                     })
+                    prune_conversation_history()
                     
-                    # Execute tool via MCP (now synchronous)
-                    result = call_mcp_tool(block.name, block.input)
-                    
-                    # Extract result content
-                    result_content = ""
-                    if result.content:
-                        if isinstance(result.content[0].text, str):
-                            result_content = result.content[0].text
-                        else:
-                            result_content = json.dumps(result.content[0].text)
-                    
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "content": result_content
-                    })
-            
-            conversation_history.append({"role": "assistant", "content": assistant_content})
-            conversation_history.append({"role": "user", "content": tool_results})
+                    turns = _run_chat(anthropic_client, claude_tools, stream=True)
+                    try:
+                        while True:
+                            yield _sse({"delta": next(turns)})
+                    except StopIteration as done:
+                        yield _sse({"response": done.value, "done": True})
+                    except Exception as e:
+                        logger.error(f"Chat error: {e}")
+                        yield _sse({"error": str(e)}, event="error")
             
-            # Get next response
-            response = anthropic_client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=4096,
-                tools=claude_tools,
-                messages=conversation_history
+            return Response(
+                generate(),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
             )
         
-        # Final text response
-        response_text = ""
-        for block in response.content:
-            if hasattr(block, 'text'):
-                response_text = block.text
-        
-        conversation_history.append({
-            "role": "assistant",
-            "content": [{"type": "text", "text": response_text}]
-        })
+        with _history_lock:
+            # Add user message to history
+            conversation_history.append({
+                "role": "user",
+                "content": user_message
+            })
+            prune_conversation_history()
+            
+            # Non-streaming turns yield nothing, so the first next() runs the whole chat
+            try:
+                next(_run_chat(anthropic_client, claude_tools, stream=False))
+            except StopIteration as done:
+                response_text = done.value
         
         return jsonify({"response": response_text})
         
@@ -366,21 +767,26 @@ def chat():
 @app.route('/api/autotrading/start', methods=['POST'])
 def start_autotrading():
     """Start auto-trading"""
-    global autotrading_active, autotrading_thread, autotrading_config, autotrading_logs
+    global autotrading_active, autotrading_thread, autotrading_config
     
-    if not anthropic_client or not mcp_session:
+    state = app.config["state"]
+    if not state.anthropic_client or not state.mcp_session:
         return jsonify({"error": "Clients not initialized"}), 400
     
     if autotrading_active:
         return jsonify({"error": "Auto-trading is already active"}), 400
     
+    if autotrading_thread is not None and autotrading_thread.is_alive():
+        return jsonify({"error": "Previous auto-trading loop is still stopping"}), 400
+    
     data = request.json
     autotrading_config = data
     
-    autotrading_logs = []
+    autotrading_logs.clear()
     add_autotrading_log(f"📊 Starting auto-trading with {len(data.get('categories', []))} categories and {len(data.get('keywords', []))} keywords", "success")
     
     autotrading_active = True
+    _autotrade_stop.clear()
     autotrading_thread = threading.Thread(target=autotrading_loop, daemon=True)
     autotrading_thread.start()
     
@@ -395,6 +801,7 @@ def stop_autotrading():
         return jsonify({"error": "Auto-trading is not active"}), 400
     
     autotrading_active = False
+    _autotrade_stop.set()
     add_autotrading_log("🛑 Stop requested by user", "info")
     
     return jsonify({"status": "stopped"})
@@ -410,8 +817,12 @@ def autotrading_status():
 @app.route('/api/autotrading/logs', methods=['GET'])
 def autotrading_logs_endpoint():
     """Get recent auto-trading logs"""
+    recent = itertools.islice(autotrading_logs, max(len(autotrading_logs) - 50, 0), None)
     return jsonify({
-        "logs": autotrading_logs[-50:]
+        "logs": [
+            {**entry, "timestamp": datetime.fromtimestamp(entry["timestamp"]).isoformat()}
+            for entry in recent
+        ]
     })
 
 def autotrading_loop():
@@ -420,61 +831,61 @@ def autotrading_loop():
     
     add_autotrading_log("🚀 Auto-trading loop started", "success")
     
-    while autotrading_active:
+    # Fetched once; re-fetched only after the cache is cleared (tools/list_changed or re-initialize)
+    claude_tools = None
+    
+    while not _autotrade_stop.is_set():
         try:
             if not autotrading_config:
-                time.sleep(5)
+                _autotrade_stop.wait(5)
                 continue
             
+            # One snapshot per cycle so a re-initialize takes effect on the next one
+            anthropic_client = app.config["state"].anthropic_client
+            
             add_autotrading_log("🔍 Analyzing market conditions...", "info")
             
-            # Get account and positions via MCP (now synchronous)
-            account_result = call_mcp_tool("get_account", {})
-            positions_result = call_mcp_tool("get_all_positions", {})
+            # Get account and positions via MCP - both requests in flight on the one session at once
+            account_future = _pool.submit(call_mcp_tool_cached, "get_account", {})
+            positions_future = _pool.submit(call_mcp_tool_cached, "get_all_positions", {})
+            account_result = account_future.result()
+            positions_result = positions_future.result()
             
             # Parse results
-            account_info = json.loads(account_result.content[0].text) if account_result.content else {}
-            positions_list = json.loads(positions_result.content[0].text) if positions_result.content else []
+            account_info = parse_mcp_result(account_result, {})
+            positions_list = parse_mcp_result(positions_result, [])
             
             add_autotrading_log(f"💰 Portfolio: ${account_info.get('portfolio_value', 0):.2f} | Cash: ${account_info.get('cash', 0):.2f} | Positions: {len(positions_list)}", "info")
             
             # Build context
             context = f"""
 MARKET FILTER:
-{json.dumps({
+{_j({
     "categories": autotrading_config.get("categories", []),
     "keywords": autotrading_config.get("keywords", []),
     "maxTradeAmount": autotrading_config.get("maxTradeAmount", 100)
-}, indent=2)}
+})}
 
 CURRENT ACCOUNT:
-{json.dumps(account_info, indent=2)}
+{_j(account_info)}
 
 CURRENT POSITIONS:
-{json.dumps(positions_list, indent=2)}
+{_j(positions_list)}
 
 Based on the configured strategy, analyze the current portfolio and market conditions, then decide if any trades should be executed.
 """
             
             add_autotrading_log("🤖 Consulting AI for trading decision...", "info")
             
-            # Get available MCP tools (now synchronous)
-            mcp_tools = list_mcp_tools()
-            claude_tools = []
-            for tool in mcp_tools.tools:
-                claude_tools.append({
-                    "name": tool.name,
-                    "description": tool.description,
-                    "input_schema": tool.inputSchema
-                })
+            if claude_tools is None or _tools_cache["claude_tools"] is None:
+                claude_tools = get_claude_tools()
             
             system_prompt = autotrading_config.get("systemPrompt", "You are an AI trading assistant.")
             strategy_prompt = autotrading_config.get("strategyPrompt", "Execute profitable trades.")
             full_prompt = f"{system_prompt}\n\nSTRATEGY: {strategy_prompt}\n\n{context}"
             
             response = anthropic_client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=4096,
+                **_MESSAGES_CREATE_DEFAULTS,
                 tools=claude_tools,
                 messages=[{"role": "user", "content": full_prompt}],
                 timeout=60.0
@@ -489,11 +900,11 @@ Based on the configured strategy, analyze the current portfolio and market condi
                         tool_name = content_block.name
                         tool_input = content_block.input
                         
-                        add_autotrading_log(f"⚡ AI executing: {tool_name} with {json.dumps(tool_input)}", "trade")
+                        add_autotrading_log(f"⚡ AI executing: {tool_name} with {_j(tool_input)}", "trade")
                         
                         try:
-                            result = call_mcp_tool(tool_name, tool_input)
-                            result_text = result.content[0].text if result.content else "No result"
+                            result = call_mcp_tool_cached(tool_name, tool_input)
+                            result_text = mcp_result_text(result) or "No result"
                             add_autotrading_log(f"✅ Tool result: {result_text[:200]}", "success")
                         except Exception as tool_error:
                             add_autotrading_log(f"❌ Tool error: {str(tool_error)}", "error")
@@ -506,12 +917,12 @@ Based on the configured strategy, analyze the current portfolio and market condi
             # Wait for next check
             interval = autotrading_config.get("checkInterval", 60)
             add_autotrading_log(f"⏰ Waiting {interval} seconds until next check...", "info")
-            time.sleep(interval)
+            _autotrade_stop.wait(interval)
             
         except Exception as e:
             add_autotrading_log(f"❌ Error: {str(e)}", "error")
             logger.exception("Auto-trading error:")
-            time.sleep(30)
+            _autotrade_stop.wait(30)
     
     add_autotrading_log("🛑 Auto-trading loop stopped", "info")
 
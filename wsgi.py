@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for the MCP trading client (trading-mcp-client.py)
+
+Run with a threaded production server instead of the Werkzeug dev server so a
+long /api/chat call doesn't hold up status and log polling:
+
+    gunicorn -k gthread -w 1 --threads 8 -b 0.0.0.0:5001 --timeout 120 wsgi:app
+
+Keep a single worker: the MCP connection, chat history and auto-trading state
+live in process memory.
+"""
+
+import importlib.util
+import os
+
+# The client script's name has a hyphen, so load it by path
+_spec = importlib.util.spec_from_file_location(
+    "trading_mcp_client",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "trading-mcp-client.py")
+)
+trading_mcp_client = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(trading_mcp_client)
+
+app = trading_mcp_client.app